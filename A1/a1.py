@@ -205,26 +205,16 @@ def print_history(history: tuple[tuple[str, str], ...]) -> None:
 	Returns:
 		None
 	"""
+    # Compose the whole frame and write it once
     if len(history) == 0:
         print('---------------\n')
-    
-    # Determine how many histories to output based on the guess_time
     else:
-        guess_time = 1
-        print('---------------')
-
-        # Make sure the history is printed in a user-friendly way
-        for index in range(len(history)):
-            print('Guess %d: ' % guess_time, end=' ')
-            for letter in history[index][0]:
-                print(letter, end=' ')  # 我是用循环输出每个字母，他直接用join，不用循环
-
-            print("\n         ", end='')
-            for result in history[index][1]:
-                print(result, end='')
-
-            print('\n---------------\n')
-            guess_time += 1  # 他也没用到guess_time，直接用enumerate函数中的编号+1来完成了
+        lines = ['---------------']
+        for guess_time, (guess, result) in enumerate(history, 1):
+            lines.append('Guess %d:  %s ' % (guess_time, ' '.join(guess)))
+            lines.append('         ' + result)
+            lines.append('---------------\n')
+        print('\n'.join(lines))
 
 
 def print_keyboard(history: tuple[tuple[str, str], ...]) -> None:
@@ -236,38 +226,27 @@ def print_keyboard(history: tuple[tuple[str, str], ...]) -> None:
 	Returns:
 		None
 	"""
-    print('\nKeyboard information\n------------')
-    loop_time = 1  # 甚至用不到loop_time，直接用for i in range(0,26,2)，然后i, i+1就好了
     keyword_info = dict()
     letters = ascii_lowercase
 
     for letter in letters:
         keyword_info[letter] = UNSEEN
 
-    if len(history) == 0:
-        for letter in letters:
-            output = letter + ': ' + keyword_info[letter]
-
-            # Ensure that only two letters are output per line
-            if loop_time % 2 != 0:
-                print(output, end='\t')
-            else:
-                print(output)
-            loop_time += 1
-    else:
-        # Combine each letter and compare_result into a one-to-one dictionary
-        for index in history:
-            for location in range(6):
-                keyword_info[index[0][location]] = index[1][location]  # 通过元组的属性我能直接找到result，然后用index来索引位置，根本不需要用字典
-
-        for letter in letters:
-            output = letter + ': ' + keyword_info[letter]
-            if loop_time % 2 != 0:
-                print(output, end='\t')
-            else:
-                print(output)
-            loop_time += 1
-        print()
+    # Combine each letter and compare_result into a one-to-one dictionary
+    for guess, result in history:
+        for location in range(6):
+            keyword_info[guess[location]] = result[location]
+
+    # Two letters per line, composed into one frame and written once
+    rows = []
+    for index in range(0, len(letters), 2):
+        first, second = letters[index], letters[index + 1]
+        rows.append(first + ': ' + keyword_info[first] + '\t'
+                    + second + ': ' + keyword_info[second])
+    frame = '\nKeyboard information\n------------\n' + '\n'.join(rows) + '\n'
+    if len(history) != 0:
+        frame += '\n'
+    print(frame, end='')
 
 
 def print_stats(stats: tuple[int, ...]) -> None:
@@ -6,9 +6,10 @@ CSSE1001/CSSE7030
 """
 from __future__ import annotations
 
+import argparse
+
 from a1_support import (
     load_words,
-    choose_word,
     VOCAB_FILE,
     ANSWERS_FILE,
     CORRECT,
@@ -16,17 +17,30 @@ from a1_support import (
     INCORRECT,
     UNSEEN,
 )
+from instrument import instrument
+from render import Renderer, TerminalRenderer
+from scheduler import load_scheduler
+from solvers import FrequencySolver, TwoTierSolver
+from stats_db import StatsLog, STATS_FILE, PLAYER, ASSISTED_PLAYER
+from suggest import Suggester
 from string import ascii_lowercase
+from time import perf_counter
 from typing import Optional
 
 WORD_LENGTH = 6
 MAX_GUESSES = 6
+SCHEDULE_FILE = "schedule.json"
+# Solvers that can give suggestions during a game
+TWO_TIER = "two-tier"
+FREQUENCY = "frequency"
+SOLVER_NAMES = (TWO_TIER, FREQUENCY)
 
 GUESS_PROMPT = "Enter guess {}: "
 PLAY_AGAIN_PROMPT = "Would you like to play again (y/n)? "
 HISTORY_TEXT = "Guess {}: {}\n         {}\n---------------"
 INVALID_LENGTH_MESSAGE = "Invalid! Guess must be of length {}"
 UNKNOWN_WORD_MESSAGE = "Invalid! Unknown word"
+SUGGESTIONS_MESSAGE = "Did you mean: {}?"
 WIN_MESSAGE = "Correct! You won in {} guesses!"
 LOSS_MESSAGE = "You lose! The answer was: {}"
 HELP_MESSAGE = "Ah, you need help? Unfortunate."
@@ -45,6 +59,7 @@ BOTTOM_ROW = " lzxcvbnm "
 COLUMNS = len(TOP_ROW) + 2
 
 
+@instrument
 def remove_word(words: tuple[str, ...], word: str) -> tuple[str, ...]:
     """Remove word from a tuple of words.
 
@@ -61,34 +76,52 @@ def remove_word(words: tuple[str, ...], word: str) -> tuple[str, ...]:
     return words[:idx] + words[idx + 1 :]
 
 
-def prompt_user(guess_number: int, words: tuple[str, ...]) -> str:
+def prompt_user(
+    guess_number: int,
+    words: tuple[str, ...],
+    suggester: Optional[Suggester] = None,
+    renderer: Optional[Renderer] = None,
+) -> str:
     """Prompts the user for the next guess, reprompting until either a valid
     guess is entered, or a selection for help, keyboard, or quit is made.
 
     Parameters:
         guess_number: The number of the current guess
         words: All known words (whole vocab).
+        suggester: If given, offers the nearest known words when an unknown
+                    word is entered.
+        renderer: Shows the prompt and messages and reads the guess; a
+                   TerminalRenderer on stdout by default.
 
     Returns:
         The lowercase guess if a valid guess is made,
         otherwise the selection of either 'h', 'q', or 'k' to represent
         help, quit, or keyboard commands.
     """
+    if renderer is None:
+        renderer = TerminalRenderer(format_history, format_keyboard)
+
     while True:
-        guess = input(GUESS_PROMPT.format(guess_number)).lower()
+        guess = renderer.prompt(GUESS_PROMPT.format(guess_number)).lower()
 
         if guess in (HELP, KEYBOARD, QUIT, SUGGESTION):
             break
         elif len(guess) != WORD_LENGTH:
-            print(INVALID_LENGTH_MESSAGE.format(WORD_LENGTH))
+            renderer.message(INVALID_LENGTH_MESSAGE.format(WORD_LENGTH))
         elif guess not in words:
-            print(UNKNOWN_WORD_MESSAGE)
+            renderer.message(UNKNOWN_WORD_MESSAGE)
+            suggestions = suggester.suggest(guess) if suggester else []
+            if suggestions:
+                renderer.message(
+                    SUGGESTIONS_MESSAGE.format(", ".join(suggestions))
+                )
         else:
             break
 
     return guess
 
 
+@instrument
 def process_guess(guess: str, answer: str) -> str:
     """Determines which letters from guess are correctly placed in answer,
         which letters are incorrectly placed from answer, and which letters
@@ -150,19 +183,34 @@ def has_lost(guess_number: int) -> bool:
     return guess_number >= MAX_GUESSES
 
 
-def print_history(history: tuple[tuple[str, str], ...]) -> None:
-    """Prints the guess history.
+def format_history(
+    history: tuple[tuple[str, str], ...], start: int = 0
+) -> str:
+    """Returns the text print_history prints, from entry start onwards.
 
     Parameters:
         history: contains tuples of (guess, processed_guess)
                   for each turn so far.
+        start: The first entry to include; the header line is only
+                included when this is 0.
     """
-    print("-" * 15)  # I <3 magic numbers
-    for i, guess_info in enumerate(history):
+    lines = ["-" * 15] if start == 0 else []  # I <3 magic numbers
+    for i, guess_info in enumerate(history[start:], start):
         guess, processed_guess = guess_info
         guess = ' ' + ' '.join(guess)
-        print(HISTORY_TEXT.format(i + 1, guess, processed_guess))
-    print()
+        lines.append(HISTORY_TEXT.format(i + 1, guess, processed_guess))
+    lines.append("\n")
+    return "\n".join(lines)
+
+
+def print_history(history: tuple[tuple[str, str], ...]) -> None:
+    """Prints the guess history.
+
+    Parameters:
+        history: contains tuples of (guess, processed_guess)
+                  for each turn so far.
+    """
+    print(format_history(history), end="")
 
 
 def letter_status(letter: str, history: tuple[tuple[str, str], ...]) -> str:
@@ -187,23 +235,36 @@ def letter_status(letter: str, history: tuple[tuple[str, str], ...]) -> str:
     return status
 
 
-def print_keyboard(history: tuple[tuple[str, str], ...]) -> None:
-    """Prints the keyboard with information currently known about each letter
+def format_keyboard(history: tuple[tuple[str, str], ...]) -> str:
+    """Returns the text print_keyboard prints.
 
     Parameters:
         history: contains tuples of (guess, processed_guess)
                   for each turn so far.
     """
-    print("\nKeyboard information\n" + COLUMNS * "-")
+    lines = ["\nKeyboard information\n" + COLUMNS * "-"]
 
     for i in range(0, 26, 2):
         first = ascii_lowercase[i]
         first_status = letter_status(first, history)
         second = ascii_lowercase[i + 1]
         second_status = letter_status(second, history)
-        print(KEYBOARD_ROW.format(first, first_status, second, second_status))
+        lines.append(
+            KEYBOARD_ROW.format(first, first_status, second, second_status)
+        )
+
+    lines.append("\n")
+    return "\n".join(lines)
+
+
+def print_keyboard(history: tuple[tuple[str, str], ...]) -> None:
+    """Prints the keyboard with information currently known about each letter
 
-    print()
+    Parameters:
+        history: contains tuples of (guess, processed_guess)
+                  for each turn so far.
+    """
+    print(format_keyboard(history), end="")
 
 
 def update_stats(stats: tuple[int, ...], guess_number: int) -> tuple[int, ...]:
@@ -284,6 +345,7 @@ def remove_duplicated_letters(
     return vocab
 
 
+@instrument
 def filter_words(
     vocab: tuple[str, ...], guess: str, position: int, status: str
 ) -> tuple[str, ...]:
@@ -330,6 +392,7 @@ def filter_words(
     return vocab
 
 
+@instrument
 def guess_next(
     vocab: tuple[str, ...], history: tuple[tuple[str, str], ...]
 ) -> Optional[str]:
@@ -363,13 +426,27 @@ def guess_next(
 ## End CSSE7030 task ##
 
 
-def play_round(answer: str, vocab: tuple[str, ...]) -> int:
+def play_round(
+    answer: str,
+    vocab: tuple[str, ...],
+    solver: Optional[TwoTierSolver | FrequencySolver] = None,
+    suggester: Optional[Suggester] = None,
+    log: Optional[StatsLog] = None,
+    renderer: Optional[Renderer] = None,
+) -> int:
     """Orchestrates a full round of Wordle with the given answer and
         allowed vocabulary.
 
     Parameters:
         answer: The answer word for this round.
         vocab: The allowed guesses vocab.
+        solver: Suggests guesses from the answer pool if given, otherwise
+                 guess_next filters the whole vocab.
+        suggester: Offers corrections for unknown words if given.
+        log: Records the round once it is won or lost, if given.
+        renderer: Shows the round; a TerminalRenderer on stdout by default.
+                   Pass render.HEADLESS to show nothing, or a Renderer
+                   given a read function to script the player too.
 
     Returns:
         The number of guesses the player took to correctly guess the word,
@@ -377,59 +454,109 @@ def play_round(answer: str, vocab: tuple[str, ...]) -> int:
     """
     history: tuple[tuple[str, str], ...] = ()
     guess_number = 0
+    player = PLAYER
+    start = perf_counter()
+    if renderer is None:
+        renderer = TerminalRenderer(format_history, format_keyboard)
 
     while True:
-        guess = prompt_user(guess_number + 1, vocab)
+        guess = prompt_user(guess_number + 1, vocab, suggester, renderer)
 
         if len(guess) == 1:
             if guess == QUIT:
                 return -1
             elif guess == KEYBOARD:
-                print_keyboard(history)
+                renderer.keyboard(history)
                 continue
             elif guess == HELP:
-                print_help()
+                renderer.message(HELP_MESSAGE)
                 continue
             elif guess == SUGGESTION:
                 # This is only necessary for CSSE7030
-                guess = guess_next(vocab, history)
+                player = ASSISTED_PLAYER
+                if solver is not None:
+                    guess = solver.guess_next(history)
+                else:
+                    guess = guess_next(vocab, history)
+                if guess is None:
+                    # No word fits the history; as in a1, the game ends here
+                    return -1
 
         # User entered a valid guess; process and display
         history = update_history(history, guess, answer)
-        print_history(history)
+        renderer.history(history)
 
         guess_number += 1
 
-        if has_won(guess, answer):
-            print(WIN_MESSAGE.format(guess_number))
+        won = has_won(guess, answer)
+        if (won or has_lost(guess_number)) and log is not None:
+            log.record_round(
+                answer, history, won, perf_counter() - start, player
+            )
+
+        if won:
+            renderer.message(WIN_MESSAGE.format(guess_number))
             return guess_number
 
         if has_lost(guess_number):
-            print(LOSS_MESSAGE.format(answer))
+            renderer.message(LOSS_MESSAGE.format(answer))
             return MAX_GUESSES + 1
 
 
-def main():
+def create_solver(
+    name: str, vocab: tuple[str, ...], answers: tuple[str, ...]
+) -> TwoTierSolver | FrequencySolver:
+    """Returns the solver called name, one of SOLVER_NAMES.
+
+    Parameters:
+        name: The solver to create.
+        vocab: The allowed guesses vocab.
+        answers: Every word that could be the answer.
+    """
+    solver = TwoTierSolver(vocab, answers)
+    if name == FREQUENCY:
+        return FrequencySolver(solver.get_answer_index())
+    return solver
+
+
+def main(argv: Optional[list[str]] = None):
     """Entry-point to gameplay."""
+    parser = argparse.ArgumentParser(description="Wordle")
+    parser.add_argument("--solver", choices=SOLVER_NAMES, default=TWO_TIER,
+                        help="the solver that suggests guesses")
+    args = parser.parse_args(argv)
+
     vocab = load_words(VOCAB_FILE)
     candidate_answers = load_words(ANSWERS_FILE)
+    solver = create_solver(args.solver, vocab, candidate_answers)
+    suggester = Suggester(vocab)
     stats = (0,) * (WORD_LENGTH + 1)
 
-    while True:
-        answer = choose_word(candidate_answers)
-        # Prevent the answer from being chosen again
-        candidate_answers = remove_word(candidate_answers, answer)
-
-        result = play_round(answer, vocab)
-        if result == -1:  # user chose to quit
-            break
-
-        stats = update_stats(stats, result)
-        print_stats(stats)
-
-        # Ask whether to exit or replay
-        if input(PLAY_AGAIN_PROMPT).lower() != YES:
-            break
+    # Deals each answer once, resuming where the last session stopped
+    scheduler = load_scheduler(SCHEDULE_FILE, candidate_answers)
+
+    log = StatsLog(STATS_FILE)
+    try:
+        while True:
+            answer = next(scheduler, None)
+            if answer is None:  # every answer has been played
+                break
+
+            result = play_round(answer, vocab, solver, suggester, log)
+            if result == -1:  # user chose to quit
+                break
+            # Only a finished round moves the saved cursor past its answer
+            scheduler.save(SCHEDULE_FILE)
+
+            stats = update_stats(stats, result)
+            print_stats(stats)
+
+            # Ask whether to exit or replay
+            if input(PLAY_AGAIN_PROMPT).lower() != YES:
+                break
+    finally:
+        # Queued rounds are written even if the game loop is interrupted
+        log.close()
 
 
 if __name__ == "__main__":
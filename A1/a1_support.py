@@ -1,6 +1,8 @@
 from __future__ import annotations
 from random import choice, seed
 
+from instrument import instrument
+
 VOCAB_FILE = "vocab.txt"
 ANSWERS_FILE = "answers.txt"
 CORRECT = "🟩"
@@ -10,6 +12,7 @@ UNSEEN = " "
 
 # seed(1001.2022)
 
+@instrument
 def load_words(filename: str) -> tuple[str,...]:
 	""" Loads all words from the file with the given name.
 
@@ -0,0 +1,216 @@
+"""
+Batch labelling of partial Wordle games.
+
+Reads one history per line, written as the tuple of (guess, processed_guess)
+pairs that update_history produces, and writes one line per history with the
+suggested next guess and the number of answers still possible, separated by
+a tab. Lines are read lazily, labelled in chunks by a pool of workers and
+written in input order, with a bounded number of chunks in flight so memory
+use does not grow with the size of the input. The words and the answer
+feedback rows are published once in shared memory (see shared_tables), so
+workers neither read the word files nor compute those rows themselves.
+
+Usage:
+    python batch_query.py [input] [output] [--workers N] [--chunk-size N]
+"""
+from __future__ import annotations
+
+import argparse
+import ast
+import sys
+from collections import deque
+from itertools import islice
+from multiprocessing import Pool, cpu_count
+from typing import Iterable, Iterator, Optional, TextIO
+
+from string import ascii_lowercase
+
+from a1_support import (
+    load_words, VOCAB_FILE, ANSWERS_FILE, CORRECT, MISPLACED, INCORRECT
+)
+from a1_solution import WORD_LENGTH, guess_next
+from shared_tables import attach, publish, SharedTables, ANSWERS, GUESSES
+from solvers import TwoTierSolver
+from word_index import WordIndex, mask_count
+
+TWO_TIER = "two-tier"
+REFERENCE = "reference"
+MODES = (TWO_TIER, REFERENCE)
+
+CHUNK_SIZE = 256
+# Chunks queued per worker before the reader waits for output to be written
+PENDING_PER_WORKER = 4
+NO_SUGGESTION = "-"
+INVALID_LINE = "!"
+OUTPUT_TEXT = "{}\t{}"
+
+LETTERS = frozenset(ascii_lowercase)
+FEEDBACK_SYMBOLS = frozenset((CORRECT, MISPLACED, INCORRECT))
+
+
+def _valid_entry(guess: str, processed: str) -> bool:
+    """Returns True iff guess is WORD_LENGTH lowercase letters and processed
+    is feedback of the same length.
+    """
+    return (
+        len(guess) == WORD_LENGTH
+        and len(processed) == WORD_LENGTH
+        and LETTERS.issuperset(guess)
+        and FEEDBACK_SYMBOLS.issuperset(processed)
+    )
+
+
+class _Labeller:
+    """Labels histories using one solver, built once per process."""
+
+    def __init__(self, mode: str, tables: Optional[SharedTables] = None
+                 ) -> None:
+        """Loads the words and builds the solver for mode.
+
+        Parameters:
+            mode: TWO_TIER to use TwoTierSolver over the answer pool, or
+                   REFERENCE to use guess_next over the whole vocab.
+            tables: Published tables to take the words and answer rows
+                    from, instead of the word files.
+        """
+        self._mode = mode
+        if tables is None:
+            self._vocab = load_words(VOCAB_FILE)
+            answers = load_words(ANSWERS_FILE)
+        else:
+            self._vocab = tables.words()
+            answers = tables.words(ANSWERS)
+        if mode == TWO_TIER:
+            self._solver = TwoTierSolver(self._vocab, answers)
+            if tables is not None:
+                index = self._solver.get_answer_index()
+                for guess in range(tables.count(GUESSES)):
+                    index.add_row(tables.word(guess, GUESSES),
+                                  tables.row(guess))
+        else:
+            self._index = WordIndex(self._vocab)
+
+    def label(self, line: str) -> str:
+        """Returns the output line for one input line."""
+        try:
+            history = tuple(
+                (str(guess), str(processed))
+                for guess, processed in ast.literal_eval(line.strip() or "()")
+            )
+        except (ValueError, TypeError, SyntaxError):
+            return OUTPUT_TEXT.format(INVALID_LINE, 0)
+        if not all(_valid_entry(*entry) for entry in history):
+            return OUTPUT_TEXT.format(INVALID_LINE, 0)
+
+        # Anything the checks above miss still only marks this one line
+        try:
+            if self._mode == TWO_TIER:
+                suggestion = self._solver.guess_next(history)
+                count = len(self._solver.candidates(history))
+            else:
+                suggestion = guess_next(self._vocab, history)
+                count = mask_count(self._index.history_mask(history))
+        except (KeyError, IndexError):
+            return OUTPUT_TEXT.format(INVALID_LINE, 0)
+        return OUTPUT_TEXT.format(suggestion or NO_SUGGESTION, count)
+
+
+_worker_labeller: Optional[_Labeller] = None
+
+
+def _init_worker(mode: str, tables_name: str) -> None:
+    """Pool initializer: builds this worker's labeller from the published
+    tables.
+    """
+    global _worker_labeller
+    tables = attach(tables_name)
+    try:
+        _worker_labeller = _Labeller(mode, tables)
+    finally:
+        tables.close()
+
+
+def _label_chunk(lines: list[str]) -> list[str]:
+    """Labels a chunk of lines in a worker."""
+    return [_worker_labeller.label(line) for line in lines]
+
+
+def _chunks(lines: Iterable[str], size: int) -> Iterator[list[str]]:
+    """Yields lists of up to size consecutive lines."""
+    lines = iter(lines)
+    chunk = list(islice(lines, size))
+    while chunk:
+        yield chunk
+        chunk = list(islice(lines, size))
+
+
+def label_histories(
+    lines: Iterable[str],
+    mode: str = TWO_TIER,
+    workers: int = 1,
+    chunk_size: int = CHUNK_SIZE,
+) -> Iterator[str]:
+    """Yields the output line for every input line, in input order.
+
+    Parameters:
+        lines: Histories, one per line.
+        mode: The solver to label with, one of MODES.
+        workers: Worker processes to use; 1 labels in this process.
+        chunk_size: Lines sent to a worker at a time.
+    """
+    if workers <= 1:
+        labeller = _Labeller(mode)
+        for line in lines:
+            yield labeller.label(line)
+        return
+
+    tables = publish(load_words(VOCAB_FILE), load_words(ANSWERS_FILE))
+    try:
+        with Pool(workers, initializer=_init_worker,
+                  initargs=(mode, tables.get_name())) as pool:
+            pending = deque()
+            for chunk in _chunks(lines, chunk_size):
+                pending.append(pool.apply_async(_label_chunk, (chunk,)))
+                if len(pending) >= workers * PENDING_PER_WORKER:
+                    yield from pending.popleft().get()
+            while pending:
+                yield from pending.popleft().get()
+    finally:
+        tables.close()
+
+
+def run(
+    source: TextIO,
+    sink: TextIO,
+    mode: str = TWO_TIER,
+    workers: int = 1,
+    chunk_size: int = CHUNK_SIZE,
+) -> None:
+    """Labels every history read from source and writes them to sink."""
+    for output in label_histories(source, mode, workers, chunk_size):
+        sink.write(output + "\n")
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    """Entry-point for the batch labelling command line."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("input", nargs="?", default="-")
+    parser.add_argument("output", nargs="?", default="-")
+    parser.add_argument("--mode", choices=MODES, default=TWO_TIER)
+    parser.add_argument("--workers", type=int, default=cpu_count())
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    args = parser.parse_args(argv)
+
+    source = sys.stdin if args.input == "-" else open(args.input)
+    sink = sys.stdout if args.output == "-" else open(args.output, "w")
+    try:
+        run(source, sink, args.mode, args.workers, args.chunk_size)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if sink is not sys.stdout:
+            sink.close()
+
+
+if __name__ == "__main__":
+    main()
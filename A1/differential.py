@@ -0,0 +1,325 @@
+"""
+Differential testing of the accelerated scorer and filter.
+
+Streams (guess, answer) pairs through the reference process_guess and the
+accelerated feedback_code and checks they give the same feedback, then
+checks that WordIndex.filter_mask keeps exactly the candidates that the
+reference filter_words keeps, both with and without the guess's partition
+cached. filter_words is only sound for guesses with no repeated letters, the
+only ones guess_next makes, so candidates for other guesses are checked
+against the words whose process_guess feedback matches instead. Pairs are drawn from the vocab, from small alphabets and
+by shuffling and repeating the letters of the answer, so repeated letters
+are heavily covered. Chunks of pairs are checked in parallel workers, and
+every mismatch found is shrunk to a minimal example before it is reported.
+
+Usage:
+    python differential.py [--pairs N] [--workers N] [--seed N] [--with-a1]
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from multiprocessing import Pool, cpu_count
+from random import Random
+from string import ascii_lowercase
+from typing import Callable, Optional
+
+from a1_support import load_words, VOCAB_FILE
+from a1_solution import WORD_LENGTH, filter_words, process_guess
+from word_index import WordIndex, decode_feedback, feedback_code
+
+Scorer = Callable[[str, str], str]
+
+CHUNK_SIZE = 20_000
+# Words in the index each chunk filters, and filter checks per chunk
+POOL_SIZE = 300
+FILTERS_PER_CHUNK = 200
+# Mismatches a chunk reports; more are likely the same bug again
+MAX_REPORTED = 5
+
+FEEDBACK = "feedback"
+CANDIDATES = "candidates"
+
+
+def accelerated_process_guess(guess: str, answer: str) -> str:
+    """Returns process_guess(guess, answer), computed through feedback_code."""
+    return decode_feedback(feedback_code(guess, answer), len(guess))
+
+
+def _scorers(with_a1: bool) -> dict[str, Scorer]:
+    """Returns the scorers to compare against the reference, by name."""
+    scorers = {"feedback_code": accelerated_process_guess}
+    if with_a1:
+        import a1
+        scorers["a1.process_guess"] = a1.process_guess
+    return scorers
+
+
+def _random_word(rng: Random, alphabet: str) -> str:
+    """Returns a word of random letters from alphabet."""
+    return "".join(rng.choice(alphabet) for _ in range(WORD_LENGTH))
+
+
+def _small_alphabet(rng: Random) -> str:
+    """Returns 1 to 4 distinct random letters."""
+    return "".join(rng.sample(ascii_lowercase, rng.randint(1, 4)))
+
+
+def _mutate(rng: Random, word: str) -> str:
+    """Returns word with its letters shuffled, or with some letters replaced
+    by copies of its other letters.
+    """
+    letters = list(word)
+    if rng.random() < 0.5:
+        rng.shuffle(letters)
+    else:
+        for _ in range(rng.randint(1, 3)):
+            letters[rng.randrange(len(letters))] = rng.choice(word)
+    return "".join(letters)
+
+
+def random_pair(rng: Random, vocab: tuple[str, ...]) -> tuple[str, str]:
+    """Returns a (guess, answer) pair drawn from the mix described above."""
+    kind = rng.random()
+    if kind < 0.25:
+        return rng.choice(vocab), rng.choice(vocab)
+    if kind < 0.5:
+        alphabet = _small_alphabet(rng)
+        return _random_word(rng, alphabet), _random_word(rng, alphabet)
+    answer = rng.choice(vocab) if kind < 0.75 else _random_word(
+        rng, _small_alphabet(rng)
+    )
+    return _mutate(rng, answer), answer
+
+
+def _random_pool(rng: Random, vocab: tuple[str, ...]) -> tuple[str, ...]:
+    """Returns distinct words to filter: vocab words, small alphabet words
+    and mutations of both.
+    """
+    # At least 4 ** WORD_LENGTH possible words, plenty to draw from
+    alphabet = "".join(rng.sample(ascii_lowercase, rng.randint(4, 6)))
+    pool = set(rng.sample(vocab, POOL_SIZE // 3))
+    while len(pool) < 2 * POOL_SIZE // 3:
+        pool.add(_random_word(rng, alphabet))
+    seeds = tuple(pool)
+    while len(pool) < POOL_SIZE:
+        pool.add(_mutate(rng, rng.choice(seeds)))
+    return tuple(sorted(pool))
+
+
+def feedback_mismatch(scorer: Scorer, guess: str, answer: str) -> bool:
+    """Returns True iff scorer disagrees with process_guess on the pair."""
+    return scorer(guess, answer) != process_guess(guess, answer)
+
+
+def reference_candidates(
+    members: tuple[str, ...], guess: str, answer: str
+) -> set[str]:
+    """Returns the members still possible after guessing guess against
+    answer: those filter_words keeps at every position, as guess_next filters
+    them, or for a guess with repeated letters (where filter_words also drops
+    the answer), those scoring the same feedback as the answer.
+    """
+    processed = process_guess(guess, answer)
+    if len(set(guess)) < len(guess):
+        return {word for word in members
+                if process_guess(guess, word) == processed}
+    words = tuple(dict.fromkeys(members))
+    for position, status in enumerate(processed):
+        words = filter_words(words, guess, position, status)
+    return set(words)
+
+
+def _filter_both(
+    index: WordIndex, mask: int, guess: str, code: int
+) -> tuple[set[str], set[str]]:
+    """Returns the words index.filter_mask keeps, first filtering word by
+    word (as it does for small uncached sets) and then through the cached
+    partition of guess.
+    """
+    direct = set(index.words_in(index.filter_mask(mask, guess, code)))
+    index.partition(guess)
+    cached = set(index.words_in(index.filter_mask(mask, guess, code)))
+    return direct, cached
+
+
+def candidates_mismatch(
+    pool: tuple[str, ...], members: tuple[str, ...], guess: str, answer: str
+) -> bool:
+    """Returns True iff filtering members of a WordIndex over pool by the
+    feedback of guess against answer keeps different words to the
+    reference, with or without the guess's partition cached.
+    """
+    expected = reference_candidates(members, guess, answer)
+    index = WordIndex(pool, max_cached=1)
+    mask = index.mask_of(index.index_of(word) for word in set(members))
+    found = _filter_both(index, mask, guess, feedback_code(guess, answer))
+    return any(words != expected for words in found)
+
+
+def _init_worker() -> None:
+    """Pool initializer: loads the vocab once per worker."""
+    global _worker_vocab
+    _worker_vocab = load_words(VOCAB_FILE)
+
+
+_worker_vocab: tuple[str, ...] = ()
+
+
+def check_chunk(task: tuple[int, int, bool]) -> tuple[int, int, list]:
+    """Checks one chunk of random pairs.
+
+    Parameters:
+        task: The chunk's seed, number of pairs and whether to include a1.
+
+    Returns:
+        The pairs checked, the filters checked and the mismatches found, as
+         (kind, implementation, details) tuples.
+    """
+    seed, count, with_a1 = task
+    rng = Random(seed)
+    vocab = _worker_vocab or load_words(VOCAB_FILE)
+    scorers = _scorers(with_a1)
+    mismatches = []
+
+    for _ in range(count):
+        guess, answer = random_pair(rng, vocab)
+        for name, scorer in scorers.items():
+            if (feedback_mismatch(scorer, guess, answer)
+                    and len(mismatches) < MAX_REPORTED):
+                mismatches.append((FEEDBACK, name, (guess, answer)))
+
+    pool = _random_pool(rng, vocab)
+    # One cached partition, so each new guess is first filtered directly
+    index = WordIndex(pool, max_cached=1)
+    filters = 0
+    for _ in range(FILTERS_PER_CHUNK):
+        answer = rng.choice(pool)
+        guess = _mutate(rng, answer) if rng.random() < 0.5 else rng.choice(pool)
+        members = [word for word in pool if rng.random() < rng.random()]
+        members.append(answer)
+        expected = reference_candidates(tuple(members), guess, answer)
+        mask = index.mask_of(index.index_of(word) for word in members)
+        found = _filter_both(index, mask, guess, feedback_code(guess, answer))
+        filters += 1
+        if (any(words != expected for words in found)
+                and len(mismatches) < MAX_REPORTED):
+            mismatches.append(
+                (CANDIDATES, "WordIndex.filter_mask",
+                 (pool, tuple(members), guess, answer))
+            )
+    return count, filters, mismatches
+
+
+def _shrink_words(
+    words: list[str], fails: Callable[[list[str]], bool]
+) -> list[str]:
+    """Greedily replaces letters of words with earlier letters while the
+    example still fails, so the result uses as few, early letters as
+    possible.
+    """
+    # First relabel letters in order of appearance, which keeps structure
+    relabel: dict[str, str] = {}
+    for char in "".join(words):
+        relabel.setdefault(char, ascii_lowercase[len(relabel)])
+    relabelled = ["".join(relabel[char] for char in word) for word in words]
+    if fails(relabelled):
+        words = relabelled
+
+    changed = True
+    while changed:
+        changed = False
+        for w, word in enumerate(words):
+            for i, char in enumerate(word):
+                for letter in ascii_lowercase[:ascii_lowercase.index(char)]:
+                    trial = list(words)
+                    trial[w] = word[:i] + letter + word[i + 1:]
+                    if fails(trial):
+                        words, word, changed = trial, trial[w], True
+                        break
+    return words
+
+
+def shrink(mismatch: tuple, with_a1: bool) -> tuple:
+    """Returns a minimal example that still shows the mismatch."""
+    kind, name, details = mismatch
+    if kind == FEEDBACK:
+        scorer = _scorers(with_a1)[name]
+        guess, answer = _shrink_words(
+            list(details),
+            lambda words: feedback_mismatch(scorer, *words),
+        )
+        return kind, name, (guess, answer, process_guess(guess, answer),
+                            scorer(guess, answer))
+
+    pool, members, guess, answer = details
+    members = tuple(dict.fromkeys(members))
+    # Keep only the answer and one word that was kept or dropped wrongly
+    for word in members:
+        if candidates_mismatch(pool, (answer, word), guess, answer):
+            members = (answer, word)
+            break
+
+    def fails(words: list[str]) -> bool:
+        guess, answer, *rest = words
+        if len(set([answer, *rest])) != len([answer, *rest]):
+            return False
+        return candidates_mismatch((answer, *rest), (answer, *rest),
+                                   guess, answer)
+
+    guess, *members = _shrink_words([guess, *members], fails)
+    return kind, name, (guess, tuple(members),
+                        process_guess(guess, members[0]))
+
+
+def run(
+    pairs: int, workers: int = 1, seed: int = 0, with_a1: bool = False
+) -> tuple[int, int, float, list]:
+    """Checks pairs random pairs across workers.
+
+    Returns:
+        The pairs checked, the filters checked, the seconds taken and the
+         shrunk mismatches.
+    """
+    tasks = [(seed * 1_000_003 + chunk, min(CHUNK_SIZE, pairs - start), with_a1)
+             for chunk, start in enumerate(range(0, pairs, CHUNK_SIZE))]
+    start = time.perf_counter()
+    if workers <= 1:
+        results = [check_chunk(task) for task in tasks]
+    else:
+        with Pool(workers, initializer=_init_worker) as pool:
+            results = pool.map(check_chunk, tasks, chunksize=1)
+    elapsed = time.perf_counter() - start
+
+    checked = sum(result[0] for result in results)
+    filters = sum(result[1] for result in results)
+    shrunk: dict[tuple, None] = {}
+    for _, _, mismatches in results:
+        for mismatch in mismatches:
+            shrunk[shrink(mismatch, with_a1)] = None
+    return checked, filters, elapsed, list(shrunk)
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    """Entry-point for differential testing from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("--pairs", type=int, default=1_000_000)
+    parser.add_argument("--workers", type=int, default=cpu_count())
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--with-a1", action="store_true",
+                        help="also compare a1.process_guess")
+    args = parser.parse_args(argv)
+
+    checked, filters, elapsed, mismatches = run(
+        args.pairs, args.workers, args.seed, args.with_a1
+    )
+    print(f"{checked:,} pairs and {filters:,} filters checked in "
+          f"{elapsed:.1f}s ({checked / elapsed:,.0f} pairs per second)")
+    for kind, name, details in mismatches:
+        print(f"{kind} mismatch in {name}: {details}")
+    if not mismatches:
+        print("No mismatches")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Opt-in call counters for the Wordle hot paths.
+
+Set the WORDLE_PROFILE environment variable to a file name to turn the
+counters on; they are written to that file as JSON when the process exits,
+when dump() is called, or (where supported) when the process receives
+SIGUSR1. Without the variable, instrument() returns the function it is given
+unchanged, so instrumented functions cost nothing extra.
+
+For each instrumented function the counters hold the number of calls and
+the total and longest wall time of a call, in seconds. Times are inclusive:
+a call to guess_next also counts the filter_words calls it makes.
+"""
+from __future__ import annotations
+
+import atexit
+import json
+import os
+import signal
+import threading
+from functools import wraps
+from time import perf_counter
+from typing import Callable, Optional, TypeVar
+
+PROFILE_VARIABLE = "WORDLE_PROFILE"
+
+PROFILE_FILE = os.environ.get(PROFILE_VARIABLE) or None
+ENABLED = PROFILE_FILE is not None
+
+F = TypeVar("F", bound=Callable)
+
+# Function name -> [calls, total seconds, longest seconds]
+_counters: dict[str, list] = {}
+
+
+def instrument(function: F) -> F:
+    """Returns function wrapped to update its counters on every call, or
+    function itself if instrumentation is off.
+    """
+    if not ENABLED:
+        return function
+
+    counters = _counters.setdefault(function.__qualname__, [0, 0.0, 0.0])
+
+    @wraps(function)
+    def timed(*args, **kwargs):
+        start = perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            elapsed = perf_counter() - start
+            counters[0] += 1
+            counters[1] += elapsed
+            if elapsed > counters[2]:
+                counters[2] = elapsed
+
+    return timed
+
+
+def get_counters() -> dict[str, dict[str, float]]:
+    """Returns a snapshot of the counters of every instrumented function."""
+    return {
+        name: {"calls": calls, "total": total, "max": longest}
+        for name, (calls, total, longest) in _counters.items()
+    }
+
+
+def reset() -> None:
+    """Sets every counter back to zero."""
+    for counters in _counters.values():
+        counters[:] = [0, 0.0, 0.0]
+
+
+def dump(filename: Optional[str] = None) -> None:
+    """Writes the counters as JSON, replacing the file atomically.
+
+    Parameters:
+        filename: The file to write; the WORDLE_PROFILE file by default.
+    """
+    filename = filename or PROFILE_FILE
+    if filename is None:
+        return
+    temp_name = filename + ".tmp"
+    with open(temp_name, "w") as file:
+        json.dump(get_counters(), file, indent=2, sort_keys=True)
+    os.replace(temp_name, filename)
+
+
+if ENABLED:
+    atexit.register(dump)
+    if (
+        hasattr(signal, "SIGUSR1")
+        and threading.current_thread() is threading.main_thread()
+    ):
+        signal.signal(signal.SIGUSR1, lambda signum, frame: dump())
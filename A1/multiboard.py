@@ -0,0 +1,235 @@
+"""
+Multi-board Wordle (Quordle/Octordle style)
+
+Every guess is played on all unsolved boards at once, each board having its
+own answer. All boards share one WordIndex, so narrowing every board's
+candidates after a guess costs one partition lookup plus one AND per board.
+"""
+from __future__ import annotations
+
+from math import log2
+from random import sample
+from typing import Optional
+
+from a1_support import load_words, VOCAB_FILE, ANSWERS_FILE
+from a1_solution import (
+    prompt_user,
+    update_history,
+    print_history,
+    print_help,
+    print_keyboard,
+    PLAY_AGAIN_PROMPT,
+    HELP,
+    KEYBOARD,
+    QUIT,
+    YES,
+    SUGGESTION,
+)
+from word_index import WordIndex, encode_feedback, feedback_code, mask_count
+
+# Number of guesses allowed for a given number of boards
+MAX_GUESSES_FOR = {1: 6, 2: 7, 4: 9, 8: 13}
+DEFAULT_BOARDS = 4
+
+# Limits on how much work a suggestion may do per turn
+PROBE_LIMIT = 40
+SAMPLE_LIMIT = 150
+
+BOARD_TEXT = "Board {}{}"
+SOLVED_TEXT = " (solved)"
+MULTI_WIN_MESSAGE = "Correct! You solved all {} boards in {} guesses!"
+MULTI_LOSS_MESSAGE = "You lose! The answers were: {}"
+
+
+class MultiBoard:
+    """The state of one multi-board round: a history and a candidate set for
+    every board, all narrowed against a shared WordIndex.
+    """
+
+    def __init__(self, answers: tuple[str, ...], index: WordIndex) -> None:
+        """Sets up a round with one board per answer.
+
+        Parameters:
+            answers: The answer for each board.
+            index: The shared index of possible answers.
+        """
+        self._answers = answers
+        self._index = index
+        self._histories: list[tuple[tuple[str, str], ...]] = [()] * len(answers)
+        self._masks = [index.full_mask] * len(answers)
+        self._solved: list[Optional[int]] = [None] * len(answers)
+        self._guess_number = 0
+
+    def get_histories(self) -> list[tuple[tuple[str, str], ...]]:
+        """Returns the guess history of each board."""
+        return self._histories
+
+    def get_masks(self) -> list[int]:
+        """Returns the candidate bitset of each board."""
+        return self._masks
+
+    def get_unsolved(self) -> list[int]:
+        """Returns the numbers of the boards that are still being played."""
+        return [i for i, solved in enumerate(self._solved) if solved is None]
+
+    def is_solved(self) -> bool:
+        """Returns True iff every board has been solved."""
+        return not self.get_unsolved()
+
+    def play_guess(self, guess: str) -> None:
+        """Plays guess on every unsolved board.
+
+        Parameters:
+            guess: A valid guess.
+        """
+        self._guess_number += 1
+        unsolved = self.get_unsolved()
+        codes = []
+        for i in unsolved:
+            self._histories[i] = update_history(
+                self._histories[i], guess, self._answers[i]
+            )
+            codes.append(encode_feedback(self._histories[i][-1][1]))
+            if guess == self._answers[i]:
+                self._solved[i] = self._guess_number
+
+        narrowed = self._index.filter_many(
+            [self._masks[i] for i in unsolved], guess, codes
+        )
+        for i, mask in zip(unsolved, narrowed):
+            self._masks[i] = mask
+
+    def print_boards(self) -> None:
+        """Prints the history of every board."""
+        for i, history in enumerate(self._histories):
+            solved = SOLVED_TEXT if self._solved[i] is not None else ""
+            print(BOARD_TEXT.format(i + 1, solved))
+            print_history(history)
+
+
+def _board_entropy(probe: str, candidates: tuple[str, ...]) -> float:
+    """Returns the expected information (in bits) probe gives about a board.
+
+    Parameters:
+        probe: The guess being scored.
+        candidates: The remaining candidates (or a sample of them) for a board.
+    """
+    counts: dict[int, int] = {}
+    for word in candidates:
+        code = feedback_code(probe, word)
+        counts[code] = counts.get(code, 0) + 1
+    total = len(candidates)
+    return -sum(n / total * log2(n / total) for n in counts.values())
+
+
+def guess_next_multi(index: WordIndex, board: MultiBoard) -> Optional[str]:
+    """Returns the guess expected to give the most combined information over
+        all unsolved boards.
+
+    A board with a single candidate left is finished off first. Otherwise
+    candidates of the unsolved boards are scored as probes by their summed
+    feedback entropy, using a sample of each board's candidates when large.
+
+    Parameters:
+        index: The index shared by the boards.
+        board: The current multi-board round.
+
+    Returns:
+        The suggested guess, or None if no board has a candidate left.
+    """
+    unsolved = board.get_unsolved()
+    masks = board.get_masks()
+    candidate_sets = []
+    for i in unsolved:
+        if mask_count(masks[i]) == 1:
+            return index.words_in(masks[i])[0]
+        words = index.words_in(masks[i])
+        if words:
+            candidate_sets.append(words)
+    if not candidate_sets:
+        return None
+
+    samples = [
+        words if len(words) <= SAMPLE_LIMIT else tuple(sample(words, SAMPLE_LIMIT))
+        for words in candidate_sets
+    ]
+    probes = []
+    for words in sorted(samples, key=len):
+        probes.extend(words[:PROBE_LIMIT - len(probes)])
+        if len(probes) >= PROBE_LIMIT:
+            break
+
+    return max(
+        probes, key=lambda probe: sum(_board_entropy(probe, s) for s in samples)
+    )
+
+
+def play_multi_round(
+    answers: tuple[str, ...], vocab: tuple[str, ...], index: WordIndex
+) -> int:
+    """Orchestrates a full multi-board round.
+
+    Parameters:
+        answers: The answer for each board.
+        vocab: The allowed guesses vocab.
+        index: The shared index of possible answers.
+
+    Returns:
+        The number of guesses taken to solve every board, -1 if the player
+        quit, or the guess limit + 1 if they lost.
+    """
+    max_guesses = MAX_GUESSES_FOR.get(len(answers), len(answers) + 5)
+    board = MultiBoard(answers, index)
+    guess_number = 0
+
+    while True:
+        guess = prompt_user(guess_number + 1, vocab)
+
+        if len(guess) == 1:
+            if guess == QUIT:
+                return -1
+            elif guess == KEYBOARD:
+                for history in board.get_histories():
+                    print_keyboard(history)
+                continue
+            elif guess == HELP:
+                print_help()
+                continue
+            elif guess == SUGGESTION:
+                guess = guess_next_multi(index, board)
+                if guess is None:
+                    # No word fits any board; as in play_round, the game ends
+                    return -1
+
+        board.play_guess(guess)
+        board.print_boards()
+        guess_number += 1
+
+        if board.is_solved():
+            print(MULTI_WIN_MESSAGE.format(len(answers), guess_number))
+            return guess_number
+
+        if guess_number >= max_guesses:
+            print(MULTI_LOSS_MESSAGE.format(", ".join(answers)))
+            return max_guesses + 1
+
+
+def main(num_boards: int = DEFAULT_BOARDS):
+    """Entry-point to multi-board gameplay.
+
+    Parameters:
+        num_boards: The number of boards played at once, e.g. 4 or 8.
+    """
+    vocab = load_words(VOCAB_FILE)
+    candidate_answers = load_words(ANSWERS_FILE)
+    index = WordIndex(vocab)
+
+    while True:
+        answers = tuple(sample(candidate_answers, num_boards))
+        result = play_multi_round(answers, vocab, index)
+        if result == -1 or input(PLAY_AGAIN_PROMPT).lower() != YES:
+            break
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Buffered output for a round of Wordle.
+
+Each frame (the history, the keyboard or a message) is composed into one
+string and written with a single call. On a terminal, the history already
+on screen is not redrawn: only the entries added since the last draw are
+written. Renderer itself draws nothing and formats nothing, so rounds played
+in bulk simulations cost no output work at all. Prompts go through the
+renderer too: Renderer reads each answer without showing the prompt.
+"""
+from __future__ import annotations
+
+import sys
+from typing import Callable, Optional, TextIO
+
+History = tuple[tuple[str, str], ...]
+
+
+class Renderer:
+    """The headless renderer: every frame is dropped without being
+    formatted, and prompts are answered without being shown.
+    """
+
+    def __init__(self, read: Optional[Callable[[], str]] = None) -> None:
+        """Sets up the renderer.
+
+        Parameters:
+            read: Returns the next line the player enters; read from stdin by
+                   default.
+        """
+        self._read = read
+
+    def prompt(self, text: str) -> str:
+        """Shows text and returns the line the player enters."""
+        return self._read_line()
+
+    def _read_line(self) -> str:
+        """Returns the next line the player enters."""
+        return self._read() if self._read is not None else input()
+
+    def history(self, history: History) -> None:
+        """Shows the guess history."""
+
+    def keyboard(self, history: History) -> None:
+        """Shows what history tells us about each letter."""
+
+    def message(self, text: str) -> None:
+        """Shows one line of text."""
+
+
+HEADLESS = Renderer()
+
+
+class TerminalRenderer(Renderer):
+    """Writes each frame to a stream in one write."""
+
+    def __init__(
+        self,
+        format_history: Callable[[History, int], str],
+        format_keyboard: Callable[[History], str],
+        stream: Optional[TextIO] = None,
+        incremental: Optional[bool] = None,
+        read: Optional[Callable[[], str]] = None,
+    ) -> None:
+        """Sets up the renderer.
+
+        Parameters:
+            format_history: Returns the text of a history from the given
+                             entry on, with the header only if that is 0.
+            format_keyboard: Returns the text of the keyboard.
+            stream: Where frames are written; sys.stdout at the time of each
+                     write by default.
+            incremental: Whether to write only new history entries; on by
+                          default iff the stream is a terminal.
+            read: Returns the next line the player enters; read from stdin
+                   by default.
+        """
+        super().__init__(read)
+        self._format_history = format_history
+        self._format_keyboard = format_keyboard
+        self._stream = stream
+        self._incremental = incremental
+        self._drawn: History = ()
+
+    def _write(self, frame: str) -> None:
+        """Writes a composed frame."""
+        stream = self._stream or sys.stdout
+        stream.write(frame)
+        stream.flush()
+
+    def _is_incremental(self) -> bool:
+        """Returns True iff only new history entries should be written."""
+        if self._incremental is None:
+            stream = self._stream or sys.stdout
+            return stream.isatty()
+        return self._incremental
+
+    def history(self, history: History) -> None:
+        start = 0
+        if (
+            self._drawn
+            and history[:len(self._drawn)] == self._drawn
+            and self._is_incremental()
+        ):
+            start = len(self._drawn)
+        self._write(self._format_history(history, start))
+        self._drawn = history
+
+    def keyboard(self, history: History) -> None:
+        # The history scrolls up out of view; draw it in full next time
+        self._drawn = ()
+        self._write(self._format_keyboard(history))
+
+    def prompt(self, text: str) -> str:
+        self._write(text)
+        return self._read_line()
+
+    def message(self, text: str) -> None:
+        self._drawn = ()
+        self._write(text + "\n")
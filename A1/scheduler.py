@@ -0,0 +1,125 @@
+"""
+Answer rotation without replacement.
+
+Answers are dealt from a seeded Fisher-Yates shuffle of their positions, one
+swap per answer, so picking the next answer is O(1) and no answer repeats
+until all have been used. The seed and cursor are all that is needed to
+recreate the order, so a session can be saved and resumed; the saved state
+also holds a hash of the answers, so it is only resumed against the same
+answer list.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from array import array
+from random import Random, randrange
+from typing import Iterator, Optional
+
+SEED_RANGE = 2 ** 32
+
+
+def answers_digest(answers: tuple[str, ...]) -> str:
+    """Returns a hash identifying the answer list, order included."""
+    return hashlib.sha256("\n".join(answers).encode()).hexdigest()
+
+
+class AnswerScheduler:
+    """Deals answers in a shuffled (or fixed) order without replacement."""
+
+    def __init__(
+        self,
+        answers: tuple[str, ...],
+        seed: Optional[int] = None,
+        cursor: int = 0,
+        shuffle: bool = True,
+    ) -> None:
+        """Sets up the scheduler, fast forwarding to cursor.
+
+        Parameters:
+            answers: The answers to deal.
+            seed: Seed for the shuffle; a random one is chosen if omitted.
+            cursor: How many answers have already been dealt.
+            shuffle: If False, answers are dealt in their given order, for
+                      reproducible benchmarks.
+        """
+        self._answers = answers
+        self._seed = randrange(SEED_RANGE) if seed is None else seed
+        self._shuffle = shuffle
+        self._random = Random(self._seed)
+        self._order = array("I", range(len(answers)))
+        self._cursor = 0
+        while self._cursor < min(cursor, len(answers)):
+            self._deal()
+
+    def _deal(self) -> int:
+        """Performs the next Fisher-Yates step and returns the dealt position."""
+        cursor = self._cursor
+        if self._shuffle:
+            swap = self._random.randrange(cursor, len(self._order))
+            order = self._order
+            order[cursor], order[swap] = order[swap], order[cursor]
+        self._cursor += 1
+        return self._order[cursor]
+
+    def __iter__(self) -> Iterator[str]:
+        return self
+
+    def __next__(self) -> str:
+        """Returns the next answer.
+
+        Raises:
+            StopIteration: if every answer has been dealt.
+        """
+        if self._cursor >= len(self._answers):
+            raise StopIteration
+        return self._answers[self._deal()]
+
+    def remaining(self) -> int:
+        """Returns the number of answers not yet dealt."""
+        return len(self._answers) - self._cursor
+
+    def get_state(self) -> dict:
+        """Returns everything needed to resume this scheduler."""
+        return {
+            "seed": self._seed,
+            "cursor": self._cursor,
+            "shuffle": self._shuffle,
+            "answers": answers_digest(self._answers),
+        }
+
+    def save(self, filename: str) -> None:
+        """Writes the scheduler state to filename, replacing it atomically.
+
+        Parameters:
+            filename: The file to save to.
+        """
+        temp_name = filename + ".tmp"
+        with open(temp_name, "w") as file:
+            json.dump(self.get_state(), file)
+        os.replace(temp_name, filename)
+
+
+def load_scheduler(
+    filename: str, answers: tuple[str, ...], shuffle: bool = True
+) -> AnswerScheduler:
+    """Resumes the scheduler saved in filename, or starts a new one if there
+        is no usable saved state for these answers or it was used up.
+
+    Parameters:
+        filename: The file the state was saved to.
+        answers: The answers being dealt.
+        shuffle: Whether a newly started scheduler shuffles.
+    """
+    try:
+        with open(filename) as file:
+            state = json.load(file)
+        if (state["answers"] == answers_digest(answers)
+                and state["cursor"] < len(answers)):
+            return AnswerScheduler(
+                answers, state["seed"], state["cursor"], state["shuffle"]
+            )
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    return AnswerScheduler(answers, shuffle=shuffle)
@@ -0,0 +1,324 @@
+"""
+Vocabulary and solver tables shared between worker processes.
+
+The parent publishes the packed word lists, a letter-presence bitmask per
+vocab word and a guess-vs-answer feedback table into one block of
+multiprocessing.shared_memory. Workers attach to the block by name and read
+it through memoryviews, so each table exists once however many workers run
+and no worker has to load or compute anything at start up.
+
+Block layout (all integers little endian):
+    header: MAGIC, word length, #vocab, #answers, #table guesses
+    vocab words, packed as word length ASCII bytes each
+    answer words, packed likewise
+    table guess words, packed likewise
+    vocab letter masks, one uint32 per vocab word (bit n set for letter n)
+    vocab sorted order, one uint32 per vocab word
+    answers sorted order, one uint32 per answer
+    feedback table, one uint16 per (table guess, answer), row major
+"""
+from __future__ import annotations
+
+import os
+import struct
+import sys
+import time
+from array import array
+from multiprocessing import Pool, shared_memory
+from multiprocessing import resource_tracker
+from typing import Optional, Sequence
+
+from a1_support import load_words, VOCAB_FILE, ANSWERS_FILE
+from word_index import WordIndex
+
+MAGIC = b"WDL1"
+HEADER = struct.Struct("<4s4I")
+
+VOCAB = "vocab"
+ANSWERS = "answers"
+GUESSES = "guesses"
+
+
+def _letter_mask(word: str) -> int:
+    """Returns a bitmask with bit n set if the nth letter is in word."""
+    mask = 0
+    for char in word:
+        mask |= 1 << (ord(char) - ord("a"))
+    return mask
+
+
+def _sorted_order(words: Sequence[str]) -> array:
+    """Returns the positions of words in sorted word order."""
+    return array("I", sorted(range(len(words)), key=words.__getitem__))
+
+
+def _as_le(values: array) -> bytes:
+    """Returns the bytes of values in little endian order."""
+    if sys.byteorder != "little":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+class SharedTables:
+    """Read access to a published block of Wordle tables."""
+
+    def __init__(self, memory: shared_memory.SharedMemory, owner: bool) -> None:
+        """Wraps an existing block. Use publish or attach instead.
+
+        Parameters:
+            memory: The shared block.
+            owner: True iff this process created the block and must unlink it.
+        """
+        self._memory = memory
+        self._owner = owner
+        buffer = memory.buf
+        header = HEADER.unpack_from(buffer)
+        magic, length, num_vocab, num_answers, num_guesses = header
+        if magic != MAGIC:
+            raise ValueError(f"{memory.name} does not hold Wordle tables")
+        self._length = length
+        self._counts = {VOCAB: num_vocab, ANSWERS: num_answers,
+                        GUESSES: num_guesses}
+
+        offset = HEADER.size
+        self._words = {}
+        for name in (VOCAB, ANSWERS, GUESSES):
+            size = self._counts[name] * length
+            self._words[name] = buffer[offset:offset + size]
+            offset += size
+        self._letter_masks = buffer[offset:offset + 4 * num_vocab].cast("I")
+        offset += 4 * num_vocab
+        self._orders = {}
+        for name in (VOCAB, ANSWERS):
+            size = 4 * self._counts[name]
+            self._orders[name] = buffer[offset:offset + size].cast("I")
+            offset += size
+        size = 2 * num_guesses * num_answers
+        self._table = buffer[offset:offset + size].cast("H")
+
+    def get_name(self) -> str:
+        """Returns the name workers attach to."""
+        return self._memory.name
+
+    def count(self, words: str = VOCAB) -> int:
+        """Returns the number of words in one of the word lists.
+
+        Parameters:
+            words: VOCAB, ANSWERS or GUESSES.
+        """
+        return self._counts[words]
+
+    def word(self, i: int, words: str = VOCAB) -> str:
+        """Returns the word at position i of one of the word lists."""
+        start = i * self._length
+        return bytes(self._words[words][start:start + self._length]).decode()
+
+    def words(self, words: str = VOCAB) -> tuple[str, ...]:
+        """Returns every word of one of the word lists, in order."""
+        text = bytes(self._words[words]).decode()
+        length = self._length
+        return tuple(text[i:i + length] for i in range(0, len(text), length))
+
+    def index_of(self, word: str, words: str = VOCAB) -> Optional[int]:
+        """Returns the position of word in VOCAB or ANSWERS, or None.
+
+        Uses binary search over the sorted order, so no per-worker dict of
+        words is needed.
+        """
+        order = self._orders[words]
+        low, high = 0, len(order)
+        while low < high:
+            mid = (low + high) // 2
+            if self.word(order[mid], words) < word:
+                low = mid + 1
+            else:
+                high = mid
+        if low < len(order) and self.word(order[low], words) == word:
+            return order[low]
+        return None
+
+    def __contains__(self, word: str) -> bool:
+        return self.index_of(word) is not None
+
+    def letter_mask(self, i: int) -> int:
+        """Returns the letter-presence bitmask of vocab word i."""
+        return self._letter_masks[i]
+
+    def feedback(self, guess: int, answer: int) -> int:
+        """Returns the feedback code of table guess guess against answer."""
+        return self._table[guess * self._counts[ANSWERS] + answer]
+
+    def row(self, guess: int) -> memoryview:
+        """Returns the feedback codes of table guess guess against every
+        answer, without copying.
+        """
+        num_answers = self._counts[ANSWERS]
+        return self._table[guess * num_answers:(guess + 1) * num_answers]
+
+    def close(self) -> None:
+        """Detaches from the block, unlinking it if this process owns it."""
+        for view in (self._letter_masks, self._table, *self._orders.values(),
+                     *self._words.values()):
+            view.release()
+        self._memory.close()
+        if self._owner:
+            if sys.version_info < (3, 13) and os.name == "posix":
+                # A worker sharing this process's resource tracker drops the
+                # block from it when attaching (see attach); registering it
+                # again, a no-op otherwise, lets unlink unregister it cleanly
+                resource_tracker.register(self._memory._name, "shared_memory")
+            self._memory.unlink()
+
+
+def publish(
+    vocab: tuple[str, ...],
+    answers: tuple[str, ...],
+    guesses: Optional[tuple[str, ...]] = None,
+    name: Optional[str] = None,
+) -> SharedTables:
+    """Builds the tables once and publishes them in shared memory.
+
+    Parameters:
+        vocab: The allowed guesses vocab.
+        answers: Every word that could be the answer.
+        guesses: The guesses to precompute feedback rows for; the answers
+                  by default.
+        name: The name of the block; chosen by the system if omitted.
+
+    Returns:
+        The owning handle. Call close() on it once workers are done.
+    """
+    if guesses is None:
+        guesses = answers
+    length = len(answers[0])
+    index = WordIndex(answers, max_cached=1)
+    table = array("H")
+    for guess in guesses:
+        table.extend(index.row(guess))
+
+    sections = [HEADER.pack(MAGIC, length, len(vocab), len(answers),
+                            len(guesses))]
+    for words in (vocab, answers, guesses):
+        sections.append("".join(words).encode("ascii"))
+    sections.append(_as_le(array("I", [_letter_mask(word) for word in vocab])))
+    sections.append(_as_le(_sorted_order(vocab)))
+    sections.append(_as_le(_sorted_order(answers)))
+    sections.append(_as_le(table))
+
+    data = b"".join(sections)
+    memory = shared_memory.SharedMemory(name=name, create=True, size=len(data))
+    memory.buf[:len(data)] = data
+    return SharedTables(memory, owner=True)
+
+
+def attach(name: str) -> SharedTables:
+    """Attaches to tables published by another process.
+
+    Parameters:
+        name: The name returned by get_name() on the publishing process.
+    """
+    if sys.version_info >= (3, 13):
+        memory = shared_memory.SharedMemory(name=name, track=False)
+    else:
+        memory = shared_memory.SharedMemory(name=name)
+        # Before Python 3.13 attaching registers the block for cleanup when
+        # this process exits, which would unlink it under the publisher
+        if os.name == "posix":
+            resource_tracker.unregister(memory._name, "shared_memory")
+    return SharedTables(memory, owner=False)
+
+
+_worker_tables: Optional[SharedTables] = None
+
+
+def init_worker(name: str) -> None:
+    """Pool initializer: attaches this worker to the published tables."""
+    global _worker_tables
+    _worker_tables = attach(name)
+
+
+def get_worker_tables() -> SharedTables:
+    """Returns the tables this worker attached to in init_worker."""
+    return _worker_tables
+
+
+def _memory_kb() -> tuple[int, int]:
+    """Returns (proportional set size, private memory) of this process in
+    kB, falling back to the peak RSS where /proc is unavailable.
+    """
+    try:
+        with open("/proc/self/smaps_rollup") as file:
+            fields = dict(line.split(":", 1) for line in file if ":" in line)
+        pss = int(fields["Pss"].split()[0])
+        private = sum(int(fields[key].split()[0])
+                      for key in ("Private_Clean", "Private_Dirty"))
+        return pss, private
+    except (OSError, KeyError, ValueError):
+        # Only imported here, as the module does not exist on Windows
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak, peak
+
+
+def _checksum(masks: Sequence[int], rows: Sequence[Sequence[int]]) -> int:
+    """Returns a checksum of letter masks and feedback rows, so the
+    benchmark can check that both ways of getting them agree.
+    """
+    return sum(masks) + sum(sum(row) * (i + 1) for i, row in enumerate(rows))
+
+
+def _own_tables_task(_: int) -> tuple[float, int, int, int]:
+    """Benchmark task: loads and builds the tables in this worker."""
+    start = time.perf_counter()
+    vocab = load_words(VOCAB_FILE)
+    answers = load_words(ANSWERS_FILE)
+    index = WordIndex(answers, max_cached=len(answers))
+    masks = array("I", [_letter_mask(word) for word in vocab])
+    rows = [index.row(guess) for guess in answers]
+    elapsed = time.perf_counter() - start
+    return elapsed, *_memory_kb(), _checksum(masks, rows)
+
+
+def _shared_tables_task(_: int) -> tuple[float, int, int, int]:
+    """Benchmark task: reads the tables this worker attached to."""
+    start = time.perf_counter()
+    tables = get_worker_tables()
+    rows = [tables.row(guess) for guess in range(tables.count(GUESSES))]
+    masks = [tables.letter_mask(i) for i in range(tables.count(VOCAB))]
+    elapsed = time.perf_counter() - start
+    return elapsed, *_memory_kb(), _checksum(masks, rows)
+
+
+def benchmark(workers: int = 4) -> None:
+    """Prints per-worker warm-up time and memory with and without shared
+    tables.
+
+    Parameters:
+        workers: The number of worker processes.
+    """
+    with Pool(workers) as pool:
+        own = pool.map(_own_tables_task, range(workers), chunksize=1)
+
+    start = time.perf_counter()
+    tables = publish(load_words(VOCAB_FILE), load_words(ANSWERS_FILE))
+    publish_time = time.perf_counter() - start
+    try:
+        with Pool(workers, initializer=init_worker,
+                  initargs=(tables.get_name(),)) as pool:
+            shared = pool.map(_shared_tables_task, range(workers), chunksize=1)
+    finally:
+        tables.close()
+
+    assert {r[3] for r in own} == {r[3] for r in shared}, "tables differ"
+    print(f"{workers} workers, publish once: {publish_time:.2f}s")
+    for label, results in (("own tables", own), ("shared", shared)):
+        warm_up = sum(r[0] for r in results) / workers
+        pss = sum(r[1] for r in results) / workers
+        private = sum(r[2] for r in results) / workers
+        print(f"{label:>10}: warm-up {warm_up:.3f}s, "
+              f"PSS {pss:,.0f} kB, private {private:,.0f} kB per worker")
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,237 @@
+"""
+Wordle solvers built on the shared word index.
+"""
+from __future__ import annotations
+
+from array import array
+from heapq import nlargest
+from math import log2
+from typing import Optional
+
+from word_index import WordIndex
+
+PROBE_LIMIT = 200
+
+
+class TwoTierSolver:
+    """A solver that keeps the possible answers apart from the allowed guesses.
+
+    Feedback only ever narrows the small answer index, so filtering cost
+    tracks the answer pool. The large vocab is only used to pick probe
+    guesses, which are scored against the remaining answers using the
+    answer index's cached guess-vs-answer rows.
+    """
+
+    def __init__(
+        self,
+        vocab: tuple[str, ...],
+        answers: tuple[str, ...],
+        answer_index: Optional[WordIndex] = None,
+    ) -> None:
+        """Sets up the solver.
+
+        Parameters:
+            vocab: The allowed guesses vocab.
+            answers: Every word that could be the answer.
+            answer_index: An existing index of answers to share, if any.
+        """
+        self._vocab = vocab
+        if answer_index is None:
+            answer_index = WordIndex(answers, max_cached=len(vocab))
+        self._answers = answer_index
+
+    def get_answer_index(self) -> WordIndex:
+        """Returns the index of possible answers."""
+        return self._answers
+
+    def candidates(self, history: tuple[tuple[str, str], ...]) -> tuple[str, ...]:
+        """Returns the answers consistent with history.
+
+        Parameters:
+            history: contains tuples of (guess, processed_guess)
+                      for each turn so far.
+        """
+        return self._answers.words_in(self._answers.history_mask(history))
+
+    def _probes(self, candidates: list[int]) -> list[str]:
+        """Returns the allowed guesses worth scoring against candidates.
+
+        These are the candidates themselves, plus the vocab words covering
+        the most letters that are common among the candidates.
+
+        Parameters:
+            candidates: Index positions of the remaining answers.
+        """
+        words = self._answers.get_words()
+        frequency: dict[str, int] = {}
+        for i in candidates:
+            for letter in set(words[i]):
+                frequency[letter] = frequency.get(letter, 0) + 1
+
+        # Letters every candidate shares tell us nothing
+        useful = {
+            letter: count for letter, count in frequency.items()
+            if count < len(candidates)
+        }
+        ranked = nlargest(
+            PROBE_LIMIT,
+            self._vocab,
+            key=lambda word: sum(useful.get(letter, 0) for letter in set(word)),
+        )
+        return [words[i] for i in candidates] + ranked
+
+    def _score(
+        self, probe: str, candidates: list[int], live: set[int]
+    ) -> float:
+        """Returns the expected information (in bits) probe gives about the
+        answer, with a small bonus if probe could itself be the answer.
+
+        Parameters:
+            probe: The guess to score.
+            candidates: Index positions of the remaining answers.
+            live: The same positions as a set.
+        """
+        row = self._answers.row(probe)
+        counts: dict[int, int] = {}
+        for i in candidates:
+            counts[row[i]] = counts.get(row[i], 0) + 1
+        total = len(candidates)
+        entropy = -sum(n / total * log2(n / total) for n in counts.values())
+        bonus = 1 / total if self._answers.index_of(probe) in live else 0
+        return entropy + bonus
+
+    def guess_next(self, history: tuple[tuple[str, str], ...]) -> Optional[str]:
+        """Returns the allowed guess that best splits the remaining answers.
+
+        Parameters:
+            history: contains tuples of all previous (guess, processed_guess)
+
+        Returns:
+            The next guess, or None if no answer is consistent with history.
+        """
+        mask = self._answers.history_mask(history)
+        candidates = self._answers.indices_in(mask)
+        if len(candidates) <= 2:
+            return self._answers.words_in(mask)[0] if candidates else None
+
+        guessed = {guess for guess, _ in history}
+        probes = [p for p in self._probes(candidates) if p not in guessed]
+        live = set(candidates)
+        return max(probes,
+                   key=lambda probe: self._score(probe, candidates, live))
+
+
+REPEAT_PENALTY = 0.5
+ALPHABET_SIZE = 26
+
+
+def _letter(char: str) -> int:
+    """Returns the alphabet position of a lowercase letter."""
+    return ord(char) - ord("a")
+
+
+class FrequencySolver:
+    """A cheap heuristic solver for one game at a time.
+
+    Candidates are scored by how common their letters are among the surviving
+    candidates, both at each position and anywhere in the word, with repeated
+    letters penalised. The frequency tables are only ever decremented for
+    the words feedback removes, so the table updates of a turn cost
+    O(removed words). Narrowing the candidate bitset and listing the words
+    it holds still cost O(vocab), but as bit operations and one bin() call
+    rather than Python work per word.
+    """
+
+    def __init__(self, index: WordIndex) -> None:
+        """Sets up the solver over a (possibly shared) index.
+
+        Parameters:
+            index: The index of possible answers.
+        """
+        self._index = index
+        self._length = len(index.get_words()[0]) if len(index) else 0
+        self._full_tables = self._tables(index.indices_in(index.full_mask))
+        self._opener: Optional[str] = None
+        self._reset()
+
+    def _reset(self) -> None:
+        """Returns the solver to the start of a game."""
+        self._history: tuple[tuple[str, str], ...] = ()
+        self._mask = self._index.full_mask
+        self._positional = array("I", self._full_tables[0])
+        self._overall = array("I", self._full_tables[1])
+
+    def _tables(self, candidates: list[int]) -> tuple[array, array]:
+        """Returns the positional and overall letter counts of candidates."""
+        words = self._index.get_words()
+        positional = array("I", bytes(4 * ALPHABET_SIZE * self._length))
+        overall = array("I", bytes(4 * ALPHABET_SIZE))
+        for i in candidates:
+            self._count(words[i], positional, overall, 1)
+        return positional, overall
+
+    def _count(
+        self, word: str, positional: array, overall: array, change: int
+    ) -> None:
+        """Adds change to the table entries for the letters of word."""
+        for position, char in enumerate(word):
+            positional[position * ALPHABET_SIZE + _letter(char)] += change
+        for char in set(word):
+            overall[_letter(char)] += change
+
+    def update(self, history: tuple[tuple[str, str], ...]) -> None:
+        """Narrows the candidates and frequency tables to agree with history.
+
+        Only the entries of history that are new since the last update are
+        applied; a history that does not extend the last one starts a new
+        game.
+
+        Parameters:
+            history: contains tuples of (guess, processed_guess)
+                      for each turn so far.
+        """
+        if history[:len(self._history)] != self._history:
+            self._reset()
+        new_entries = history[len(self._history):]
+        if not new_entries:
+            return
+
+        mask = self._index.history_mask(new_entries, self._mask)
+        words = self._index.get_words()
+        for i in self._index.indices_in(self._mask & ~mask):
+            self._count(words[i], self._positional, self._overall, -1)
+        self._mask = mask
+        self._history = history
+
+    def _score(self, word: str, total: int) -> float:
+        """Returns the frequency score of word."""
+        positional, overall = self._positional, self._overall
+        score = sum(
+            positional[position * ALPHABET_SIZE + _letter(char)]
+            for position, char in enumerate(word)
+        )
+        letters = set(word)
+        score += sum(overall[_letter(char)] for char in letters)
+        return score - REPEAT_PENALTY * total * (len(word) - len(letters))
+
+    def guess_next(self, history: tuple[tuple[str, str], ...]) -> Optional[str]:
+        """Returns the remaining candidate with the best frequency score.
+
+        Parameters:
+            history: contains tuples of all previous (guess, processed_guess)
+
+        Returns:
+            The next guess, or None if no candidate is consistent with history.
+        """
+        self.update(history)
+        if self._mask == self._index.full_mask and self._opener is not None:
+            return self._opener
+
+        candidates = self._index.words_in(self._mask)
+        if not candidates:
+            return None
+        total = len(candidates)
+        best = max(candidates, key=lambda word: self._score(word, total))
+        if self._mask == self._index.full_mask:
+            self._opener = best
+        return best
@@ -0,0 +1,340 @@
+"""
+Persistent statistics and game log.
+
+Every finished round is stored in a local SQLite database: the answer, each
+guess with its feedback code, how long the round took and which solver (or
+player) made the guesses. Rounds are handed to a background writer thread
+through a queue, so recording a round never waits on the disk; the writer
+inserts whatever has queued up in one transaction. Round ids are assigned
+by SQLite, so several processes can log to the same database.
+
+Alongside the raw log the writer keeps a result_counts table with one row
+per (answer, solver, won, guesses), updated in the same transaction. The
+analytics queries read that table through its primary key rather than the
+log, so their cost depends on the number of distinct answers and solvers,
+not the number of rounds played.
+
+Usage:
+    python stats_db.py [database]
+"""
+from __future__ import annotations
+
+import queue
+import sqlite3
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Optional
+
+from word_index import encode_feedback
+
+STATS_FILE = "stats.db"
+PLAYER = "player"
+ASSISTED_PLAYER = "player+hints"
+
+# Most rounds written in one transaction
+BATCH_SIZE = 512
+HARDEST_LIMIT = 10
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS rounds (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    played_at REAL NOT NULL,
+    answer TEXT NOT NULL,
+    solver TEXT NOT NULL,
+    won INTEGER NOT NULL,
+    guesses INTEGER NOT NULL,
+    duration REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS guesses (
+    round_id INTEGER NOT NULL REFERENCES rounds(id),
+    turn INTEGER NOT NULL,
+    guess TEXT NOT NULL,
+    feedback INTEGER NOT NULL,
+    PRIMARY KEY (round_id, turn)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS result_counts (
+    answer TEXT NOT NULL,
+    solver TEXT NOT NULL,
+    won INTEGER NOT NULL,
+    guesses INTEGER NOT NULL,
+    rounds INTEGER NOT NULL,
+    PRIMARY KEY (answer, solver, won, guesses)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS rounds_by_answer ON rounds (answer, played_at);
+CREATE INDEX IF NOT EXISTS rounds_by_solver ON rounds (solver, played_at);
+CREATE INDEX IF NOT EXISTS result_counts_by_solver
+    ON result_counts (solver, won, guesses);
+"""
+
+INSERT_ROUND = (
+    "INSERT INTO rounds (played_at, answer, solver, won, guesses, duration) "
+    "VALUES (?, ?, ?, ?, ?, ?)"
+)
+INSERT_GUESS = "INSERT INTO guesses VALUES (?, ?, ?, ?)"
+COUNT_RESULT = """
+INSERT INTO result_counts VALUES (?, ?, ?, ?, ?)
+ON CONFLICT (answer, solver, won, guesses)
+DO UPDATE SET rounds = rounds + excluded.rounds
+"""
+
+# Put on the queue to stop the writer once everything before it is written
+_STOP = object()
+
+
+def _connect(filename: str) -> sqlite3.Connection:
+    """Opens the database, creating the tables if needed."""
+    connection = sqlite3.connect(filename, timeout=30)
+    # WAL lets queries read while the writer thread is mid-transaction
+    connection.execute("PRAGMA journal_mode = WAL")
+    connection.execute("PRAGMA synchronous = NORMAL")
+    connection.executescript(SCHEMA)
+    return connection
+
+
+class StatsLog:
+    """Records rounds in the background and answers queries about them."""
+
+    def __init__(self, filename: str = STATS_FILE) -> None:
+        """Opens (or creates) the database and starts the writer thread.
+
+        Parameters:
+            filename: The database file.
+        """
+        self._filename = filename
+        _connect(filename).close()
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._error: Optional[Exception] = None
+        self._closed = False
+        self._reader: Optional[sqlite3.Connection] = None
+        self._writer = threading.Thread(target=self._write_loop, daemon=True)
+        self._writer.start()
+
+    def record_round(
+        self,
+        answer: str,
+        history: tuple[tuple[str, str], ...],
+        won: bool,
+        duration: float,
+        solver: str = PLAYER,
+    ) -> None:
+        """Queues a finished round to be written. Never waits on the database.
+
+        Parameters:
+            answer: The answer word for the round.
+            history: The (guess, processed_guess) pairs of the round.
+            won: True iff the last guess was the answer.
+            duration: Seconds the round took.
+            solver: The name of whoever made the guesses.
+
+        Raises:
+            ValueError: if a processed guess holds anything other than
+                CORRECT, MISPLACED and INCORRECT.
+        """
+        # Encode here so a bad round fails in the caller, not the writer
+        try:
+            encoded = tuple((guess, encode_feedback(processed))
+                            for guess, processed in history)
+        except KeyError as error:
+            raise ValueError(
+                f"invalid feedback in round: {history!r}"
+            ) from error
+        self._queue.put(
+            (time.time(), answer, solver, won, encoded, duration)
+        )
+
+    def _write_loop(self) -> None:
+        """Writer thread: writes queued rounds in batches until stopped."""
+        connection = _connect(self._filename)
+        stopping = False
+        while not stopping:
+            batch = []
+            waiting = []
+            try:
+                item = self._queue.get()
+                while True:
+                    if item is _STOP:
+                        stopping = True
+                    elif isinstance(item, threading.Event):
+                        waiting.append(item)
+                    else:
+                        batch.append(item)
+                    if stopping or len(batch) >= BATCH_SIZE:
+                        break
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+
+                if batch:
+                    self._write_batch(connection, batch)
+            except Exception as error:
+                # The batch is lost but the writer keeps going; the error
+                # is raised by the next flush or close
+                self._error = error
+            finally:
+                for event in waiting:
+                    event.set()
+        connection.close()
+
+    def _write_batch(
+        self, connection: sqlite3.Connection, batch: list
+    ) -> None:
+        """Writes a batch of queued rounds in one transaction.
+
+        Round ids are assigned by SQLite, so other processes may write to
+        the same database.
+        """
+        results = Counter()
+        with connection:
+            guesses = []
+            for item in batch:
+                played_at, answer, solver, won, history, duration = item
+                round_id = connection.execute(
+                    INSERT_ROUND, (played_at, answer, solver, int(won),
+                                   len(history), duration)
+                ).lastrowid
+                guesses.extend(
+                    (round_id, turn, guess, code)
+                    for turn, (guess, code) in enumerate(history, 1)
+                )
+                results[answer, solver, int(won), len(history)] += 1
+            connection.executemany(INSERT_GUESS, guesses)
+            connection.executemany(
+                COUNT_RESULT, [(*key, count) for key, count in results.items()]
+            )
+
+    def flush(self) -> None:
+        """Waits until every round recorded so far has been written.
+
+        Raises:
+            Exception: whatever made a write fail since the last flush.
+            RuntimeError: if the writer thread has stopped, so the rounds
+                recorded since can never be written.
+        """
+        written = threading.Event()
+        self._queue.put(written)
+        # Poll so a writer that dies while we wait cannot hang us
+        while not written.wait(0.1) and self._writer.is_alive():
+            pass
+        self._raise_error()
+        if not written.is_set():
+            raise RuntimeError("stats writer thread has stopped")
+
+    def close(self) -> None:
+        """Writes any queued rounds and stops the writer thread.
+
+        Raises:
+            Exception: whatever made a write fail since the last flush.
+        """
+        if not self._closed:
+            self._closed = True
+            self._queue.put(_STOP)
+            self._writer.join()
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
+        self._raise_error()
+
+    def _raise_error(self) -> None:
+        """Raises, and clears, the error the writer last hit, if any."""
+        error, self._error = self._error, None
+        if error is not None:
+            raise error
+
+    def _query(self, sql: str, parameters: tuple = ()) -> list[tuple]:
+        """Runs a read-only query after writing any queued rounds."""
+        self.flush()
+        if self._reader is None:
+            self._reader = _connect(self._filename)
+        return self._reader.execute(sql, parameters).fetchall()
+
+    def guess_distribution(
+        self, answer: str, solver: Optional[str] = None
+    ) -> dict[int, int]:
+        """Returns how many rounds with this answer were won in each number of
+            guesses. Lost rounds are counted under 0.
+
+        Parameters:
+            answer: The answer word.
+            solver: Only count rounds played by this solver, if given.
+        """
+        sql = ("SELECT CASE WHEN won THEN guesses ELSE 0 END, SUM(rounds) "
+               "FROM result_counts WHERE answer = ?")
+        parameters = (answer,)
+        if solver is not None:
+            sql += " AND solver = ?"
+            parameters += (solver,)
+        sql += " GROUP BY 1 ORDER BY 1"
+        return dict(self._query(sql, parameters))
+
+    def hardest_answers(
+        self, limit: int = HARDEST_LIMIT, solver: Optional[str] = None
+    ) -> list[tuple[str, float, float, int]]:
+        """Returns the answers with the lowest win rate, breaking ties by the
+            most guesses taken on average.
+
+        Parameters:
+            limit: The most answers to return.
+            solver: Only count rounds played by this solver, if given.
+
+        Returns:
+            (answer, win rate, mean guesses, rounds) for each answer.
+        """
+        where = "" if solver is None else "WHERE solver = ?"
+        parameters = () if solver is None else (solver,)
+        sql = f"""
+            SELECT answer,
+                   1.0 * SUM(won * rounds) / SUM(rounds) AS win_rate,
+                   1.0 * SUM(guesses * rounds) / SUM(rounds) AS mean_guesses,
+                   SUM(rounds)
+            FROM result_counts {where}
+            GROUP BY answer
+            ORDER BY win_rate, mean_guesses DESC, answer
+            LIMIT ?
+        """
+        return self._query(sql, parameters + (limit,))
+
+    def compare_solvers(self) -> list[tuple[str, int, float, float]]:
+        """Returns, for each solver, (solver, rounds, win rate, mean guesses
+            in won rounds), best win rate first.
+        """
+        sql = """
+            SELECT solver,
+                   SUM(rounds),
+                   1.0 * SUM(won * rounds) / SUM(rounds) AS win_rate,
+                   1.0 * SUM(won * guesses * rounds)
+                       / MAX(SUM(won * rounds), 1) AS mean_guesses
+            FROM result_counts
+            GROUP BY solver
+            ORDER BY win_rate DESC, mean_guesses, solver
+        """
+        return self._query(sql)
+
+    def get_round(self, round_id: int) -> list[tuple[str, int]]:
+        """Returns the (guess, feedback code) of each turn of a round."""
+        return self._query(
+            "SELECT guess, feedback FROM guesses WHERE round_id = ? "
+            "ORDER BY turn", (round_id,)
+        )
+
+
+def report(filename: str = STATS_FILE) -> None:
+    """Prints a solver comparison and the hardest answers in filename."""
+    log = StatsLog(filename)
+    try:
+        print("Solvers:")
+        for solver, rounds, win_rate, mean in log.compare_solvers():
+            print(f"  {solver:<16} {rounds:>7} rounds, {win_rate:6.1%} won, "
+                  f"{mean:.2f} guesses per win")
+        print("Hardest answers:")
+        for answer, win_rate, mean, rounds in log.hardest_answers():
+            print(f"  {answer}  {win_rate:6.1%} won, {mean:.2f} guesses, "
+                  f"{rounds} rounds")
+    finally:
+        log.close()
+
+
+if __name__ == "__main__":
+    report(*sys.argv[1:2])
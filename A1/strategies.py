@@ -0,0 +1,296 @@
+"""
+Named solver strategies and a head-to-head harness.
+
+A strategy is a factory registered under a name. It is given the process's
+SolverContext, which builds the word indexes the first time any strategy
+asks for them and then shares them, together with the feedback rows they
+cache, with every other strategy. The factory returns a solver: any object
+with a guess_next(history) method.
+
+The existing guess_next functions are registered as "guess_next" and
+"a1.guess_next". They filter the whole vocab on every call, taking seconds
+per game, so they are left out of the default comparison; "first" makes the
+same guesses through the shared index.
+
+Usage:
+    python strategies.py [name ...] [--limit N]
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from random import Random
+from typing import Callable, Optional, Protocol, Sequence
+
+from a1_support import load_words, VOCAB_FILE, ANSWERS_FILE
+from a1_solution import MAX_GUESSES, guess_next, has_won, update_history
+from solvers import FrequencySolver, TwoTierSolver
+from word_index import WordIndex
+
+RANDOM_SEED = 1001
+
+
+class Solver(Protocol):
+    """Anything that can choose the next guess of a game."""
+
+    def guess_next(
+        self, history: tuple[tuple[str, str], ...]
+    ) -> Optional[str]:
+        ...
+
+
+class SolverContext:
+    """Word lists and the tables derived from them, each built on first use
+    and shared by every strategy given this context.
+    """
+
+    def __init__(
+        self, vocab: tuple[str, ...], answers: tuple[str, ...]
+    ) -> None:
+        """Sets up the context without building anything.
+
+        Parameters:
+            vocab: The allowed guesses vocab.
+            answers: Every word that could be the answer.
+        """
+        self._vocab = vocab
+        self._answers = answers
+        self._vocab_index: Optional[WordIndex] = None
+        self._answer_index: Optional[WordIndex] = None
+
+    def get_vocab(self) -> tuple[str, ...]:
+        """Returns the allowed guesses vocab."""
+        return self._vocab
+
+    def get_answers(self) -> tuple[str, ...]:
+        """Returns every word that could be the answer."""
+        return self._answers
+
+    def get_vocab_index(self) -> WordIndex:
+        """Returns the index of the whole vocab."""
+        if self._vocab_index is None:
+            self._vocab_index = WordIndex(self._vocab)
+        return self._vocab_index
+
+    def get_answer_index(self) -> WordIndex:
+        """Returns the index of the answers, caching the feedback row of any
+        vocab word against every answer.
+        """
+        if self._answer_index is None:
+            self._answer_index = WordIndex(
+                self._answers, max_cached=len(self._vocab)
+            )
+        return self._answer_index
+
+
+StrategyFactory = Callable[[SolverContext], Solver]
+
+_STRATEGIES: dict[str, StrategyFactory] = {}
+
+
+def register(name: str) -> Callable[[StrategyFactory], StrategyFactory]:
+    """Returns a decorator registering a strategy factory under name.
+
+    Raises:
+        ValueError: if name is already registered.
+    """
+    def decorate(factory: StrategyFactory) -> StrategyFactory:
+        if name in _STRATEGIES:
+            raise ValueError(f"Strategy {name!r} is already registered")
+        _STRATEGIES[name] = factory
+        return factory
+    return decorate
+
+
+def get_strategy_names() -> tuple[str, ...]:
+    """Returns the names of every registered strategy."""
+    return tuple(_STRATEGIES)
+
+
+def create_solver(name: str, context: SolverContext) -> Solver:
+    """Returns a new solver of the strategy registered under name.
+
+    Raises:
+        KeyError: if no strategy has that name.
+    """
+    return _STRATEGIES[name](context)
+
+
+class FirstCandidateSolver:
+    """Guesses the first vocab word with no repeated letters consistent with
+    the history, as guess_next does.
+    """
+
+    def __init__(self, index: WordIndex) -> None:
+        """Sets up the solver over an index of the vocab."""
+        self._index = index
+        self._unique_mask = index.mask_of(
+            i for i, word in enumerate(index.get_words())
+            if len(set(word)) == len(word)
+        )
+
+    def guess_next(self, history: tuple[tuple[str, str], ...]) -> Optional[str]:
+        """Returns the first consistent word, or None if there is none."""
+        mask = self._index.history_mask(history) & self._unique_mask
+        if not mask:
+            return None
+        return self._index.get_words()[(mask & -mask).bit_length() - 1]
+
+
+class RandomCandidateSolver:
+    """Guesses a random vocab word consistent with the history."""
+
+    def __init__(self, index: WordIndex, seed: Optional[int] = None) -> None:
+        """Sets up the solver over an index of the vocab, seeding its choices."""
+        self._index = index
+        self._random = Random(seed)
+
+    def guess_next(self, history: tuple[tuple[str, str], ...]) -> Optional[str]:
+        """Returns a random consistent word, or None if there is none."""
+        candidates = self._index.words_in(self._index.history_mask(history))
+        return self._random.choice(candidates) if candidates else None
+
+
+class ReferenceSolver:
+    """Wraps an existing guess_next function, which filters the whole vocab
+    on every call and is too slow to run over every answer.
+    """
+
+    def __init__(
+        self,
+        vocab: tuple[str, ...],
+        function: Callable[
+            [tuple[str, ...], tuple[tuple[str, str], ...]], Optional[str]
+        ] = guess_next,
+    ) -> None:
+        """Sets up the solver over the vocab.
+
+        Parameters:
+            vocab: The allowed guesses vocab.
+            function: The guess_next function to wrap.
+        """
+        self._vocab = vocab
+        self._function = function
+
+    def guess_next(self, history: tuple[tuple[str, str], ...]) -> Optional[str]:
+        """Returns the wrapped guess_next for history."""
+        return self._function(self._vocab, history)
+
+
+@register("first")
+def _first(context: SolverContext) -> Solver:
+    return FirstCandidateSolver(context.get_vocab_index())
+
+
+@register("random")
+def _random(context: SolverContext) -> Solver:
+    return RandomCandidateSolver(context.get_vocab_index(), RANDOM_SEED)
+
+
+@register("frequency")
+def _frequency(context: SolverContext) -> Solver:
+    return FrequencySolver(context.get_answer_index())
+
+
+@register("two-tier")
+def _two_tier(context: SolverContext) -> Solver:
+    return TwoTierSolver(
+        context.get_vocab(), context.get_answers(), context.get_answer_index()
+    )
+
+
+@register("guess_next")
+def _guess_next(context: SolverContext) -> Solver:
+    return ReferenceSolver(context.get_vocab())
+
+
+@register("a1.guess_next")
+def _a1_guess_next(context: SolverContext) -> Solver:
+    import a1
+    return ReferenceSolver(context.get_vocab(), a1.guess_next)
+
+
+DEFAULT_STRATEGIES = ("first", "random", "frequency", "two-tier")
+
+
+def play_solver(solver: Solver, answer: str) -> int:
+    """Plays one game with solver choosing every guess.
+
+    Returns:
+        The number of guesses taken to win, or MAX_GUESSES + 1 if the game
+         was lost or the solver ran out of guesses.
+    """
+    history: tuple[tuple[str, str], ...] = ()
+    for guess_number in range(1, MAX_GUESSES + 1):
+        guess = solver.guess_next(history)
+        if guess is None:
+            break
+        history = update_history(history, guess, answer)
+        if has_won(guess, answer):
+            return guess_number
+    return MAX_GUESSES + 1
+
+
+def head_to_head(
+    names: Sequence[str] = DEFAULT_STRATEGIES,
+    answers: Optional[Sequence[str]] = None,
+    context: Optional[SolverContext] = None,
+) -> list[tuple[str, float, float, float]]:
+    """Plays every answer with each named strategy, sharing one context.
+
+    Parameters:
+        names: The strategies to compare.
+        answers: The answers to play; every answer in the context by default.
+        context: The context to share; loaded from the word files by default.
+
+    Returns:
+        (name, fraction of games won, mean guesses in won games, CPU
+         seconds) for each strategy, in the order given.
+    """
+    if context is None:
+        context = SolverContext(load_words(VOCAB_FILE), load_words(ANSWERS_FILE))
+    if answers is None:
+        answers = context.get_answers()
+
+    results = []
+    for name in names:
+        start = time.process_time()
+        solver = create_solver(name, context)
+        wins = total = 0
+        for answer in answers:
+            result = play_solver(solver, answer)
+            if result <= MAX_GUESSES:
+                wins += 1
+                total += result
+        cpu_time = time.process_time() - start
+        results.append(
+            (name, wins / max(len(answers), 1), total / max(wins, 1), cpu_time)
+        )
+    return results
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    """Entry-point for comparing strategies from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("names", nargs="*", metavar="name",
+                        help="one of: " + ", ".join(get_strategy_names()))
+    parser.add_argument("--limit", type=int, default=None,
+                        help="only play the first N answers")
+    args = parser.parse_args(argv)
+    names = args.names or DEFAULT_STRATEGIES
+    unknown = [name for name in names if name not in get_strategy_names()]
+    if unknown:
+        parser.error("unknown strategy: " + ", ".join(unknown))
+
+    context = SolverContext(load_words(VOCAB_FILE), load_words(ANSWERS_FILE))
+    answers = context.get_answers()[:args.limit]
+    print(f"{len(answers)} answers")
+    for name, accuracy, mean, cpu_time in head_to_head(
+        names, answers, context
+    ):
+        print(f"{name:>10}: {accuracy:6.1%} won, {mean:.2f} guesses per win, "
+              f"{cpu_time:.2f}s CPU")
+
+
+if __name__ == "__main__":
+    main()
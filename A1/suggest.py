@@ -0,0 +1,132 @@
+"""
+"Did you mean" suggestions for guesses that are not in the vocab.
+
+Guesses reaching the unknown word check already have the right length, so
+words are compared by substitution edit distance, with ties broken by how
+far apart the substituted keys are on a QWERTY keyboard. Close words are
+found through buckets built once at load time: each word is filed under
+every copy of itself with one letter blanked out, and under every copy with
+two letters blanked out. Words within distance 1 of a guess share one of its
+one-blank buckets and words within distance 2 share one of its two-blank
+buckets, so either search is one dict lookup per key and only reads the words
+it returns.
+"""
+from __future__ import annotations
+
+from itertools import combinations
+from typing import Iterable
+
+KEYBOARD_ROWS = ("qwertyuiop", "asdfghjkl", "zxcvbnm")
+BLANK = "_"
+SUGGESTION_LIMIT = 3
+# Most letters blanked out of one bucket key, and so the widest search
+FALLBACK_RADIUS = 2
+
+# Cost of typing one key in place of another
+SAME_KEY = 0
+ADJACENT_KEY = 1
+DISTANT_KEY = 2
+
+
+def _key_neighbours() -> dict[str, set[str]]:
+    """Returns the keys physically touching each key on the keyboard.
+
+    Each row is shifted half a key right of the row above, so key c on one
+    row touches keys c - 1 and c on the row below and c and c + 1 above.
+    """
+    neighbours: dict[str, set[str]] = {}
+    for row_num, row in enumerate(KEYBOARD_ROWS):
+        for col, key in enumerate(row):
+            touching = {row[i] for i in (col - 1, col + 1) if 0 <= i < len(row)}
+            if row_num + 1 < len(KEYBOARD_ROWS):
+                below = KEYBOARD_ROWS[row_num + 1]
+                touching.update(below[i] for i in (col - 1, col)
+                                if 0 <= i < len(below))
+            if row_num > 0:
+                above = KEYBOARD_ROWS[row_num - 1]
+                touching.update(above[i] for i in (col, col + 1)
+                                if 0 <= i < len(above))
+            neighbours[key] = touching
+    return neighbours
+
+
+KEY_NEIGHBOURS = _key_neighbours()
+
+
+def edit_distance(word: str, other: str) -> int:
+    """Returns the number of letters that must be substituted to turn word
+        into other.
+
+    Precondition: len(word) == len(other)
+    """
+    return sum(a != b for a, b in zip(word, other))
+
+
+def keyboard_distance(word: str, other: str) -> int:
+    """Returns the substitution distance between two words where a letter
+        swapped for a neighbouring key costs less than any other swap.
+
+    Precondition: len(word) == len(other)
+    """
+    distance = 0
+    for a, b in zip(word, other):
+        if a == b:
+            distance += SAME_KEY
+        elif b in KEY_NEIGHBOURS.get(a, ()):
+            distance += ADJACENT_KEY
+        else:
+            distance += DISTANT_KEY
+    return distance
+
+
+class Suggester:
+    """Finds the vocab words closest to a rejected guess."""
+
+    def __init__(self, words: Iterable[str], limit: int = SUGGESTION_LIMIT):
+        """Builds the suggestion indexes.
+
+        Parameters:
+            words: All known words (whole vocab).
+            limit: The most suggestions to return.
+        """
+        self._limit = limit
+        self._buckets: dict[str, list[str]] = {}
+        for word in words:
+            for blanks in range(1, FALLBACK_RADIUS + 1):
+                for key in self._bucket_keys(word, blanks):
+                    self._buckets.setdefault(key, []).append(word)
+
+    def _bucket_keys(self, word: str, blanks: int) -> list[str]:
+        """Returns word with each choice of blanks of its letters blanked out.
+        """
+        keys = []
+        for positions in combinations(range(len(word)), blanks):
+            letters = list(word)
+            for i in positions:
+                letters[i] = BLANK
+            keys.append("".join(letters))
+        return keys
+
+    def _within(self, guess: str, distance: int) -> set[str]:
+        """Returns the known words other than guess within distance of it."""
+        return {
+            word for key in self._bucket_keys(guess, distance)
+            for word in self._buckets.get(key, ()) if word != guess
+        }
+
+    def suggest(self, guess: str) -> list[str]:
+        """Returns the known words nearest to guess, closest first.
+
+        Parameters:
+            guess: A guess that was rejected as an unknown word.
+        """
+        close = self._within(guess, 1)
+        if not close:
+            close = self._within(guess, FALLBACK_RADIUS)
+        ranked = sorted(
+            close,
+            key=lambda word: (
+                edit_distance(guess, word), keyboard_distance(guess, word), word
+            ),
+        )
+        return ranked[:self._limit]
@@ -0,0 +1,44 @@
+"""Tests for saving and resuming the answer scheduler."""
+from scheduler import AnswerScheduler, load_scheduler
+
+ANSWERS = ("crates", "joking", "larned", "tories", "bifold", "adults")
+
+
+def test_deals_every_answer_once():
+    scheduler = AnswerScheduler(ANSWERS, seed=1)
+    assert sorted(scheduler) == sorted(ANSWERS)
+    assert scheduler.remaining() == 0
+
+
+def test_resume_continues_the_same_order(tmp_path):
+    filename = str(tmp_path / "schedule.json")
+    full_order = list(AnswerScheduler(ANSWERS, seed=7))
+
+    scheduler = AnswerScheduler(ANSWERS, seed=7)
+    dealt = [next(scheduler), next(scheduler)]
+    scheduler.save(filename)
+
+    resumed = load_scheduler(filename, ANSWERS)
+    assert dealt + list(resumed) == full_order
+
+
+def test_changed_answers_with_same_count_start_over(tmp_path):
+    filename = str(tmp_path / "schedule.json")
+    scheduler = AnswerScheduler(ANSWERS, seed=7)
+    next(scheduler)
+    scheduler.save(filename)
+
+    edited = ANSWERS[:-1] + ("zonked",)
+    resumed = load_scheduler(filename, edited)
+    assert resumed.remaining() == len(edited)
+    assert sorted(resumed) == sorted(edited)
+
+
+def test_used_up_or_missing_state_starts_over(tmp_path):
+    filename = str(tmp_path / "schedule.json")
+    assert load_scheduler(filename, ANSWERS).remaining() == len(ANSWERS)
+
+    scheduler = AnswerScheduler(ANSWERS, seed=3)
+    list(scheduler)
+    scheduler.save(filename)
+    assert load_scheduler(filename, ANSWERS).remaining() == len(ANSWERS)
@@ -0,0 +1,66 @@
+"""Tests for the positional letter-frequency solver."""
+import os
+
+import pytest
+
+from a1_support import load_words, ANSWERS_FILE, VOCAB_FILE
+from a1_solution import (
+    FREQUENCY,
+    MAX_GUESSES,
+    create_solver,
+    has_won,
+    update_history,
+)
+from solvers import FrequencySolver
+from word_index import WordIndex
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+@pytest.fixture(scope="module")
+def answers():
+    return load_words(os.path.join(HERE, ANSWERS_FILE))
+
+
+def play(solver, answer):
+    """Returns the number of guesses solver takes, or MAX_GUESSES + 1."""
+    history = ()
+    for guess_number in range(1, MAX_GUESSES + 1):
+        guess = solver.guess_next(history)
+        if guess is None:
+            break
+        history = update_history(history, guess, answer)
+        if has_won(guess, answer):
+            return guess_number
+    return MAX_GUESSES + 1
+
+
+def test_solves_every_answer(answers):
+    solver = FrequencySolver(WordIndex(answers))
+    results = [play(solver, answer) for answer in answers]
+    assert max(results) <= MAX_GUESSES
+
+
+def test_tables_track_the_candidates(answers):
+    index = WordIndex(answers)
+    solver = FrequencySolver(index)
+    history = update_history((), solver.guess_next(()), "joking")
+    solver.guess_next(history)
+
+    rebuilt = solver._tables(index.indices_in(index.history_mask(history)))
+    assert (solver._positional, solver._overall) == rebuilt
+
+
+def test_new_history_starts_a_new_game(answers):
+    solver = FrequencySolver(WordIndex(answers))
+    opener = solver.guess_next(())
+    solver.guess_next(update_history((), opener, "joking"))
+    assert solver.guess_next(()) == opener
+    assert solver.guess_next(update_history((), opener, "crates")) is not None
+
+
+def test_game_can_use_the_frequency_solver(answers):
+    vocab = load_words(os.path.join(HERE, VOCAB_FILE))
+    solver = create_solver(FREQUENCY, vocab, answers)
+    assert isinstance(solver, FrequencySolver)
+    assert solver.guess_next(()) in answers
@@ -0,0 +1,46 @@
+"""Tests for "did you mean" suggestions."""
+import pytest
+
+from suggest import (
+    KEY_NEIGHBOURS,
+    Suggester,
+    edit_distance,
+    keyboard_distance,
+)
+
+WORDS = ("abound", "around", "aground", "bounds", "sounds", "wounds",
+         "abrupt", "absent")
+
+
+def test_key_neighbours_are_symmetric():
+    assert KEY_NEIGHBOURS["g"] == {"f", "h", "t", "y", "v", "b"}
+    for key, touching in KEY_NEIGHBOURS.items():
+        assert all(key in KEY_NEIGHBOURS[other] for other in touching)
+
+
+def test_distances():
+    assert edit_distance("abound", "around") == 1
+    assert keyboard_distance("sounds", "wounds") == 1
+    assert keyboard_distance("sounds", "bounds") == 2
+    assert keyboard_distance("abound", "abound") == 0
+
+
+def test_closest_words_come_first():
+    suggester = Suggester(WORDS)
+    # One substitution away from all three; adjacent keys rank first
+    assert suggester.suggest("dounds") == ["sounds", "bounds", "wounds"]
+
+
+def test_falls_back_to_two_substitutions():
+    suggester = Suggester(WORDS)
+    assert suggester.suggest("abrext") == ["abrupt", "absent"]
+    assert suggester.suggest("xyxyxy") == []
+
+
+@pytest.mark.parametrize("limit", [1, 2])
+def test_suggestions_are_limited(limit):
+    assert len(Suggester(WORDS, limit).suggest("dounds")) == limit
+
+
+def test_the_guess_itself_is_not_suggested():
+    assert "abound" not in Suggester(WORDS).suggest("abound")
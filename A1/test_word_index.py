@@ -0,0 +1,76 @@
+"""Tests for the shared word index and the multi-board game built on it."""
+import os
+from itertools import product
+
+import pytest
+
+from a1_support import load_words, VOCAB_FILE
+from a1_solution import filter_words, process_guess
+from multiboard import MultiBoard, guess_next_multi
+from word_index import (
+    WordIndex,
+    decode_feedback,
+    encode_feedback,
+    feedback_code,
+)
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+PAIRS = [
+    ("crates", "crates"),
+    ("abound", "abrupt"),
+    ("eerily", "tepees"),
+    ("aaabbb", "bbbaaa"),
+    ("llamas", "salmon"),
+    ("zzzzzz", "abcdef"),
+]
+
+
+@pytest.fixture(scope="module")
+def vocab():
+    return load_words(os.path.join(HERE, VOCAB_FILE))
+
+
+@pytest.mark.parametrize("guess, answer", PAIRS)
+def test_feedback_code_matches_process_guess(guess, answer):
+    processed = process_guess(guess, answer)
+    code = feedback_code(guess, answer)
+    assert code == encode_feedback(processed)
+    assert decode_feedback(code, len(guess)) == processed
+
+
+def test_every_code_round_trips():
+    for code in range(3 ** 3):
+        assert encode_feedback(decode_feedback(code, 3)) == code
+
+
+def test_filter_mask_matches_filter_words(vocab):
+    words = tuple(word for word in vocab[:3000] if len(set(word)) == len(word))
+    index = WordIndex(words)
+    for guess, answer in product(words[:4], words[100:104]):
+        processed = process_guess(guess, answer)
+        expected = words
+        for position, status in enumerate(processed):
+            expected = filter_words(expected, guess, position, status)
+
+        mask = index.filter_mask(index.full_mask, guess,
+                                 feedback_code(guess, answer))
+        assert index.words_in(mask) == expected
+
+
+def test_history_mask_narrows_to_the_answer(vocab):
+    index = WordIndex(vocab)
+    history = ()
+    for guess in ("crates", "abound", "tepees"):
+        history += ((guess, process_guess(guess, "joking")),)
+    assert "joking" in index.words_in(index.history_mask(history))
+
+
+def test_multiboard_suggestion_is_none_without_candidates():
+    index = WordIndex(("abound", "abrupt", "absent"))
+    board = MultiBoard(("abound", "absent"), index)
+    board.play_guess("abrupt")
+    assert guess_next_multi(index, board) in ("abound", "absent")
+
+    board.get_masks()[:] = [0, 0]
+    assert guess_next_multi(index, board) is None
@@ -0,0 +1,55 @@
+"""Tests for the DAWG word store."""
+import os
+
+import pytest
+
+from a1_support import load_words, VOCAB_FILE
+from word_store import WordStore, _tuple_query
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+WORDS = ("abound", "abrupt", "absent", "around", "bounds", "sounds")
+
+
+@pytest.fixture(scope="module")
+def vocab():
+    return load_words(os.path.join(HERE, VOCAB_FILE))
+
+
+@pytest.fixture(scope="module")
+def store(vocab):
+    return WordStore(vocab)
+
+
+def test_every_word_is_a_member(vocab, store):
+    assert len(store) == len(set(vocab))
+    assert all(word in store for word in vocab)
+    assert list(store) == sorted(set(vocab))
+
+
+@pytest.mark.parametrize(
+    "word", ["", "abou", "abounds", "abounx", "ab€def", "\xe1bound", 5]
+)
+def test_non_members(word):
+    assert word not in WordStore(WORDS)
+
+
+@pytest.mark.parametrize("pattern, required, excluded", [
+    ("?a??e?", "", ""),
+    ("??????", "qz", ""),
+    ("s?????", "", "aeiou"),
+    ("?r??n?", "o", "s"),
+    ("zzzzzz", "", ""),
+])
+def test_query_matches_a_scan(vocab, store, pattern, required, excluded):
+    expected = sorted(_tuple_query(vocab, pattern, required, excluded))
+    assert list(store.query(pattern, required, excluded)) == expected
+
+
+def test_query_only_matches_the_pattern_length():
+    store = WordStore(WORDS + ("bound", "sound"))
+    assert list(store.query("?ound")) == ["bound", "sound"]
+    assert list(store.query("??ound")) == ["abound", "around"]
+    assert list(store.query(None, required="s", excluded="b")) == [
+        "sound", "sounds"
+    ]
@@ -0,0 +1,187 @@
+"""
+Hot-reloadable vocabulary and answer sets.
+
+The word files are polled for changes. When one changes, the word-level
+difference against the current state is applied to copies of the derived
+indexes (rather than rebuilding them), and the new state is swapped in with
+a single reference assignment. A session keeps using the snapshot it started
+with, so a reload never changes the words under a running round.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import threading
+from typing import Optional
+
+from a1_support import load_words, VOCAB_FILE, ANSWERS_FILE
+from solvers import TwoTierSolver
+from word_index import WordIndex
+
+POLL_INTERVAL = 1.0
+
+logger = logging.getLogger(__name__)
+
+
+class VocabularySnapshot:
+    """An unchanging view of the vocab, the answers and the indexes derived
+    from them.
+    """
+
+    def __init__(
+        self,
+        vocab: tuple[str, ...],
+        answers: tuple[str, ...],
+        answer_index: WordIndex,
+        version: int,
+    ) -> None:
+        """Sets up the snapshot.
+
+        Parameters:
+            vocab: The allowed guesses vocab.
+            answers: Every word that could be the answer.
+            answer_index: An index whose live words are exactly answers.
+            version: The number of reloads before this snapshot.
+        """
+        self._vocab = vocab
+        self._vocab_set = frozenset(vocab)
+        self._answers = answers
+        self._answer_index = answer_index
+        self._solver = TwoTierSolver(vocab, answers, answer_index)
+        self._version = version
+
+    def get_vocab(self) -> tuple[str, ...]:
+        """Returns the allowed guesses vocab."""
+        return self._vocab
+
+    def get_vocab_set(self) -> frozenset[str]:
+        """Returns the vocab as a set, for fast guess validation."""
+        return self._vocab_set
+
+    def get_answers(self) -> tuple[str, ...]:
+        """Returns every word that could be the answer."""
+        return self._answers
+
+    def get_answer_index(self) -> WordIndex:
+        """Returns the index of the answers."""
+        return self._answer_index
+
+    def get_solver(self) -> TwoTierSolver:
+        """Returns a solver over this snapshot's words."""
+        return self._solver
+
+    def get_version(self) -> int:
+        """Returns the number of reloads before this snapshot."""
+        return self._version
+
+
+class ReloadableVocabulary:
+    """Holds the current VocabularySnapshot and replaces it when the word
+    files change on disk.
+    """
+
+    def __init__(
+        self, vocab_file: str = VOCAB_FILE, answers_file: str = ANSWERS_FILE
+    ) -> None:
+        """Loads the word files.
+
+        Parameters:
+            vocab_file: The file of allowed guesses.
+            answers_file: The file of possible answers.
+        """
+        self._vocab_file = vocab_file
+        self._answers_file = answers_file
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._watcher: Optional[threading.Thread] = None
+
+        self._stamps = self._read_stamps()
+        vocab = load_words(vocab_file)
+        answers = load_words(answers_file)
+        self._current = VocabularySnapshot(
+            vocab, answers, WordIndex(answers, max_cached=len(vocab)), 0
+        )
+
+    def current(self) -> VocabularySnapshot:
+        """Returns the latest snapshot. Sessions should keep the returned
+        snapshot for as long as they need consistent words.
+        """
+        return self._current
+
+    def _read_stamps(self) -> tuple[tuple[int, int], ...]:
+        """Returns the (modification time, size) of each word file."""
+        stamps = []
+        for filename in (self._vocab_file, self._answers_file):
+            stat = os.stat(filename)
+            stamps.append((stat.st_mtime_ns, stat.st_size))
+        return tuple(stamps)
+
+    def check(self) -> bool:
+        """Reloads the word files if they have changed since the last check.
+
+        The files are only marked as seen once they have loaded, so a
+        failed reload is tried again by the next check.
+
+        Returns:
+            True iff a new snapshot was swapped in.
+        """
+        with self._lock:
+            stamps = self._read_stamps()
+            if stamps == self._stamps:
+                return False
+
+            old = self._current
+            vocab = load_words(self._vocab_file)
+            answers = load_words(self._answers_file)
+            if vocab == old.get_vocab() and answers == old.get_answers():
+                self._stamps = stamps
+                return False
+
+            old_answers = set(old.get_answers())
+            removed = old_answers - set(answers)
+            index = old.get_answer_index()
+            if index.get_removed_count() + len(removed) > len(answers):
+                # Mostly removed positions left; cheaper to start over
+                index = WordIndex(answers, max_cached=len(vocab))
+            else:
+                index = index.with_changes(
+                    [word for word in answers if word not in old_answers],
+                    removed,
+                )
+
+            self._current = VocabularySnapshot(
+                vocab, answers, index, old.get_version() + 1
+            )
+            self._stamps = stamps
+            return True
+
+    def watch(self, interval: float = POLL_INTERVAL) -> None:
+        """Starts checking the word files in a background thread.
+
+        Parameters:
+            interval: Seconds between checks.
+        """
+        if self._watcher is not None:
+            return
+        self._stop.clear()
+
+        def poll() -> None:
+            while not self._stop.wait(interval):
+                try:
+                    self.check()
+                except OSError:
+                    # A file mid-replacement; try again next interval
+                    continue
+                except Exception:
+                    # Keep the current snapshot and keep watching
+                    logger.exception("Reloading the word files failed")
+
+        self._watcher = threading.Thread(target=poll, daemon=True)
+        self._watcher.start()
+
+    def stop(self) -> None:
+        """Stops the background watcher, if one is running."""
+        self._stop.set()
+        if self._watcher is not None:
+            self._watcher.join()
+            self._watcher = None
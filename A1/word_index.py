@@ -0,0 +1,294 @@
+"""
+Shared vocabulary index for the Wordle solvers.
+
+Feedback is stored as a small integer code (one base 3 digit per letter) and
+candidate sets are held as int bitsets over the indexed words, so narrowing a
+candidate set by a guess is a single AND against a precomputed partition.
+"""
+from __future__ import annotations
+
+from array import array
+from typing import Iterable, Optional
+
+from a1_support import CORRECT, MISPLACED, INCORRECT
+
+# Position of a status in this tuple is its base 3 digit
+STATUSES = (INCORRECT, MISPLACED, CORRECT)
+STATUS_DIGITS = {status: digit for digit, status in enumerate(STATUSES)}
+
+MAX_CACHED_GUESSES = 1024
+# Candidate sets this small are checked word by word instead of partitioned
+DIRECT_FILTER_LIMIT = 512
+
+
+def feedback_code(guess: str, answer: str) -> int:
+    """Returns the feedback process_guess would give for guess as a code.
+
+    Precondition: len(guess) == len(answer)
+
+    Parameters:
+        guess: The guess made by the player.
+        answer: The answer for this round.
+
+    Returns:
+        The base 3 code of the processed guess, most significant digit first.
+    """
+    code = 0
+    for i, char in enumerate(guess):
+        if char == answer[i]:
+            code = code * 3 + 2
+        elif (
+            char in answer
+            and char not in guess[:i]
+            and guess[answer.index(char)] != char
+        ):
+            code = code * 3 + 1
+        else:
+            code = code * 3
+    return code
+
+
+def encode_feedback(processed_guess: str) -> int:
+    """Returns the code for a processed guess, as produced by process_guess.
+
+    Parameters:
+        processed_guess: A string of CORRECT, MISPLACED and INCORRECT squares.
+    """
+    code = 0
+    for status in processed_guess:
+        code = code * 3 + STATUS_DIGITS[status]
+    return code
+
+
+def decode_feedback(code: int, length: int) -> str:
+    """Returns the processed guess represented by code.
+
+    Parameters:
+        code: A feedback code returned by feedback_code or encode_feedback.
+        length: The length of the guess the code was made for.
+    """
+    statuses = []
+    for _ in range(length):
+        code, digit = divmod(code, 3)
+        statuses.append(STATUSES[digit])
+    return "".join(reversed(statuses))
+
+
+def mask_count(mask: int) -> int:
+    """Returns the number of words in the candidate bitset mask."""
+    return bin(mask).count("1")
+
+
+class WordIndex:
+    """A universe of words with cached guess-vs-word feedback.
+
+    Every guess that is looked up gets one row of feedback codes against the
+    whole universe, computed once and shared by everything using the index,
+    along with the partition of the universe by that feedback.
+
+    An index is never changed once built; with_changes derives a new one.
+    Removed words keep their position but are left out of full_mask.
+    """
+
+    def __init__(
+        self, words: Iterable[str], max_cached: int = MAX_CACHED_GUESSES
+    ) -> None:
+        """Indexes words.
+
+        Parameters:
+            words: The universe of possible answers.
+            max_cached: The number of guesses to keep rows and partitions for.
+        """
+        self._words = tuple(words)
+        self._positions = {word: i for i, word in enumerate(self._words)}
+        self._max_cached = max_cached
+        self._rows: dict[str, array] = {}
+        self._partitions: dict[str, dict[int, int]] = {}
+        self.full_mask = (1 << len(self._words)) - 1
+        self._size = len(self._positions)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, word: str) -> bool:
+        position = self._positions.get(word)
+        return position is not None and bool(self.full_mask >> position & 1)
+
+    def get_words(self) -> tuple[str, ...]:
+        """Returns the word at every position of the index, in index order,
+        including the positions of removed words.
+        """
+        return self._words
+
+    def get_removed_count(self) -> int:
+        """Returns the number of positions held by removed words."""
+        return len(self._words) - self._size
+
+    def with_changes(
+        self, added: Iterable[str], removed: Iterable[str]
+    ) -> WordIndex:
+        """Returns a copy of this index with words added and removed.
+
+        Existing positions are kept, so cached rows and partitions carry
+        over and only need feedback computed for the added words.
+
+        Parameters:
+            added: Words to add; words already present are ignored.
+            removed: Words to remove; words not present are ignored.
+        """
+        changed = WordIndex((), self._max_cached)
+        positions = dict(self._positions)
+        full_mask = self.full_mask
+        new_words = []
+        for word in added:
+            position = positions.get(word)
+            if position is None:
+                position = positions[word] = len(self._words) + len(new_words)
+                new_words.append(word)
+            full_mask |= 1 << position
+        for word in removed:
+            position = positions.get(word)
+            if position is not None:
+                full_mask &= ~(1 << position)
+
+        first_new = len(self._words)
+        changed._words = self._words + tuple(new_words)
+        changed._positions = positions
+        changed.full_mask = full_mask
+        changed._size = mask_count(full_mask)
+
+        # Snapshots, as another thread may be filling or evicting the caches
+        rows = list(self._rows.items())
+        partitions = list(self._partitions.items())
+        for guess, row in rows:
+            extra = [feedback_code(guess, word) for word in new_words]
+            changed._rows[guess] = row + array("H", extra)
+        for guess, partition in partitions:
+            partition = dict(partition)
+            for offset, word in enumerate(new_words):
+                code = feedback_code(guess, word)
+                bit = 1 << (first_new + offset)
+                partition[code] = partition.get(code, 0) | bit
+            changed._partitions[guess] = partition
+        return changed
+
+    def index_of(self, word: str) -> Optional[int]:
+        """Returns the position of word in the index, or None if absent."""
+        return self._positions.get(word)
+
+    def row(self, guess: str) -> array:
+        """Returns the feedback code of guess against every indexed word.
+
+        Parameters:
+            guess: Any word of the same length as the indexed words.
+        """
+        row = self._rows.get(guess)
+        if row is None:
+            row = array("H", [feedback_code(guess, word) for word in self._words])
+            self._remember(self._rows, guess, row)
+        return row
+
+    def add_row(self, guess: str, row: Iterable[int]) -> None:
+        """Caches a row of feedback codes computed elsewhere, such as in a
+        shared table, so row(guess) does not compute it again.
+
+        Precondition: row holds feedback_code(guess, word) for every indexed
+            word, in index order.
+        """
+        self._remember(self._rows, guess, array("H", row))
+
+    def partition(self, guess: str) -> dict[int, int]:
+        """Returns a mapping from feedback code to the bitset of indexed words
+        that would give that feedback for guess.
+
+        Parameters:
+            guess: Any word of the same length as the indexed words.
+        """
+        partition = self._partitions.get(guess)
+        if partition is None:
+            groups: dict[int, list[int]] = {}
+            for i, code in enumerate(self.row(guess)):
+                groups.setdefault(code, []).append(i)
+            partition = {code: self.mask_of(idxs) for code, idxs in groups.items()}
+            self._remember(self._partitions, guess, partition)
+        return partition
+
+    def _remember(self, cache: dict, guess: str, value) -> None:
+        """Stores value in cache, evicting the oldest entry when it is full."""
+        if len(cache) >= self._max_cached:
+            del cache[next(iter(cache))]
+        cache[guess] = value
+
+    def mask_of(self, indices: Iterable[int]) -> int:
+        """Returns the bitset with the given word positions set."""
+        bits = bytearray(b"0") * len(self._words)
+        for i in indices:
+            bits[i] = ord("1")
+        bits.reverse()
+        return int(bits, 2) if bits else 0
+
+    def indices_in(self, mask: int) -> list[int]:
+        """Returns the word positions set in mask, in index order."""
+        bits = bin(mask)[:1:-1]
+        indices = []
+        i = bits.find("1")
+        while i != -1:
+            indices.append(i)
+            i = bits.find("1", i + 1)
+        return indices
+
+    def words_in(self, mask: int) -> tuple[str, ...]:
+        """Returns the words whose bits are set in mask, in index order."""
+        return tuple(self._words[i] for i in self.indices_in(mask))
+
+    def filter_mask(self, mask: int, guess: str, code: int) -> int:
+        """Returns the words in mask that would have given feedback code for
+        guess.
+
+        Small candidate sets are checked directly unless guess has already
+        been partitioned, so late turns cost O(candidates) rather than a row
+        over the whole index.
+        """
+        cached = guess in self._partitions
+        if not cached and mask_count(mask) <= DIRECT_FILTER_LIMIT:
+            words = self._words
+            return self.mask_of(
+                i for i in self.indices_in(mask)
+                if feedback_code(guess, words[i]) == code
+            )
+        return mask & self.partition(guess).get(code, 0)
+
+    def filter_many(
+        self, masks: list[int], guess: str, codes: list[int]
+    ) -> list[int]:
+        """Narrows several candidate sets by the same guess in one pass.
+
+        The partition for guess is looked up once and shared, so narrowing n
+        sets costs one partition plus n ANDs.
+
+        Parameters:
+            masks: The candidate bitset of each board.
+            guess: The guess made on every board.
+            codes: The feedback code each board gave for guess.
+
+        Returns:
+            The narrowed bitset of each board.
+        """
+        partition = self.partition(guess)
+        return [mask & partition.get(code, 0) for mask, code in zip(masks, codes)]
+
+    def history_mask(
+        self, history: tuple[tuple[str, str], ...], mask: Optional[int] = None
+    ) -> int:
+        """Returns the words consistent with every entry of history.
+
+        Parameters:
+            history: contains tuples of (guess, processed_guess)
+                      for each turn so far.
+            mask: The candidates to start from; all indexed words by default.
+        """
+        if mask is None:
+            mask = self.full_mask
+        for guess, processed in history:
+            mask = self.filter_mask(mask, guess, encode_feedback(processed))
+        return mask
@@ -0,0 +1,257 @@
+"""
+Minimised trie (DAWG) store for the Wordle vocabulary.
+
+Words sharing prefixes and suffixes share nodes, and the finished graph is
+packed into a few flat arrays instead of one str object per word. It answers
+membership (so it can be passed to prompt_user in place of the vocab tuple)
+and pattern queries such as "?a??e?" with required and excluded letters,
+pruning branches as it walks instead of scanning every word.
+"""
+from __future__ import annotations
+
+import sys
+from array import array
+from timeit import timeit
+from typing import Iterable, Iterator, Optional
+
+from a1_support import load_words, VOCAB_FILE
+
+WILDCARD = "?"
+
+
+class _BuildNode:
+    """A node of the trie while it is being built and minimised."""
+
+    def __init__(self) -> None:
+        self.edges: dict[str, _BuildNode] = {}
+        self.final = False
+
+    def signature(self) -> tuple:
+        """Returns a key equal for nodes with identical right languages."""
+        edges = sorted(self.edges.items())
+        return self.final, tuple((char, id(child)) for char, child in edges)
+
+
+class WordStore:
+    """A set of lowercase words stored as a DAWG.
+
+    Node n owns the edges first_edge[n] to first_edge[n + 1] - 1; each edge
+    has a letter in labels and a destination node in targets. Node 0 is the
+    root.
+    """
+
+    def __init__(self, words: Iterable[str]) -> None:
+        """Builds the store from words.
+
+        Parameters:
+            words: The words to store, in any order.
+        """
+        words = sorted(set(words))
+        self._size = len(words)
+        self._freeze(self._build(words))
+
+    def _build(self, words: list[str]) -> _BuildNode:
+        """Returns the root of the minimal DAWG for sorted words.
+
+        Uses incremental construction: after each word, the part of the
+        previous word not shared with it can no longer change, so it is
+        replaced by equivalent nodes already seen wherever possible.
+        """
+        root = _BuildNode()
+        register: dict[tuple, _BuildNode] = {}
+        # (parent, letter, child) along the path of the previous word
+        unchecked: list[tuple[_BuildNode, str, _BuildNode]] = []
+        previous = ""
+
+        for word in words:
+            common = 0
+            while (
+                common < min(len(word), len(previous))
+                and word[common] == previous[common]
+            ):
+                common += 1
+            self._minimise(unchecked, common, register)
+
+            node = unchecked[-1][2] if unchecked else root
+            for char in word[common:]:
+                child = _BuildNode()
+                node.edges[char] = child
+                unchecked.append((node, char, child))
+                node = child
+            node.final = True
+            previous = word
+
+        self._minimise(unchecked, 0, register)
+        return root
+
+    def _minimise(
+        self,
+        unchecked: list[tuple[_BuildNode, str, _BuildNode]],
+        down_to: int,
+        register: dict[tuple, _BuildNode],
+    ) -> None:
+        """Merges the unchecked nodes deeper than down_to into the register."""
+        while len(unchecked) > down_to:
+            parent, char, child = unchecked.pop()
+            key = child.signature()
+            existing = register.get(key)
+            if existing is not None:
+                parent.edges[char] = existing
+            else:
+                register[key] = child
+
+    def _freeze(self, root: _BuildNode) -> None:
+        """Packs the graph reachable from root into flat arrays."""
+        numbers = {id(root): 0}
+        order = [root]
+        for node in order:
+            for child in node.edges.values():
+                if id(child) not in numbers:
+                    numbers[id(child)] = len(order)
+                    order.append(child)
+
+        self._first_edge = array("I", [0])
+        labels = bytearray()
+        self._targets = array("I")
+        self._final = bytearray(len(order))
+        for n, node in enumerate(order):
+            for char, child in sorted(node.edges.items()):
+                labels.append(ord(char))
+                self._targets.append(numbers[id(child)])
+            self._first_edge.append(len(labels))
+            self._final[n] = node.final
+        self._labels = bytes(labels)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _child(self, node: int, char: str) -> int:
+        """Returns the node reached from node by char, or -1 if none."""
+        code = ord(char)
+        # Labels are single bytes, so no edge can match a wider character
+        if code > 0xFF:
+            return -1
+        edge = self._labels.find(
+            code, self._first_edge[node], self._first_edge[node + 1]
+        )
+        return -1 if edge == -1 else self._targets[edge]
+
+    def __contains__(self, word: object) -> bool:
+        if not isinstance(word, str):
+            return False
+        node = 0
+        for char in word:
+            node = self._child(node, char)
+            if node == -1:
+                return False
+        return bool(self._final[node])
+
+    def __iter__(self) -> Iterator[str]:
+        return self.query(None)
+
+    def query(
+        self,
+        pattern: Optional[str] = None,
+        required: str = "",
+        excluded: str = "",
+    ) -> Iterator[str]:
+        """Yields the stored words matching a pattern, in sorted order.
+
+        Parameters:
+            pattern: One letter or WILDCARD per position; None matches every
+                      word of any length.
+            required: Letters that must appear somewhere in the word.
+            excluded: Letters that must not appear anywhere in the word.
+        """
+        required_set = frozenset(required)
+        excluded_codes = frozenset(ord(char) for char in excluded)
+        labels, targets = self._labels, self._targets
+        first_edge, final = self._first_edge, self._final
+
+        stack = [(0, "")]
+        while stack:
+            node, prefix = stack.pop()
+            depth = len(prefix)
+            if pattern is not None:
+                if depth == len(pattern):
+                    if final[node] and required_set <= set(prefix):
+                        yield prefix
+                    continue
+                missing = len(required_set - set(prefix))
+                if missing > len(pattern) - depth:
+                    continue
+                wanted = pattern[depth]
+            else:
+                if final[node] and required_set <= set(prefix):
+                    yield prefix
+                wanted = WILDCARD
+
+            # Pushed in reverse so that words come out in sorted order
+            start, end = first_edge[node], first_edge[node + 1]
+            for edge in range(end - 1, start - 1, -1):
+                code = labels[edge]
+                if code in excluded_codes:
+                    continue
+                if wanted != WILDCARD and code != ord(wanted):
+                    continue
+                stack.append((targets[edge], prefix + chr(code)))
+
+    def get_size_in_bytes(self) -> int:
+        """Returns the memory used by the packed arrays of this store."""
+        parts = (self._first_edge, self._labels, self._targets, self._final)
+        return sum(sys.getsizeof(part) for part in parts)
+
+
+def load_store(filename: str) -> WordStore:
+    """Loads all words from the file with the given name into a WordStore.
+
+    Parameters:
+        filename: The name of the file to load from. Each word must be on
+                   a separate line.
+    """
+    return WordStore(load_words(filename))
+
+
+def _tuple_query(
+    words: tuple[str, ...], pattern: str, required: str, excluded: str
+) -> list[str]:
+    """Answers a pattern query by scanning words, as a baseline."""
+    return [
+        word for word in words
+        if all(p == WILDCARD or p == c for p, c in zip(pattern, word))
+        and all(char in word for char in required)
+        and not any(char in word for char in excluded)
+    ]
+
+
+def report(filename: str = VOCAB_FILE, repeat: int = 200) -> None:
+    """Prints the memory and query latency of a WordStore against the
+    tuple returned by load_words.
+
+    Parameters:
+        filename: The word list to compare on.
+        repeat: Number of times each query is timed.
+    """
+    words = load_words(filename)
+    store = WordStore(words)
+    tuple_bytes = sys.getsizeof(words) + sum(sys.getsizeof(word) for word in words)
+    print(f"{len(words)} words")
+    print(f"tuple: {tuple_bytes:>10,} bytes")
+    print(f"store: {store.get_size_in_bytes():>10,} bytes")
+
+    probes = words[::max(1, len(words) // 100)]
+    member_tuple = timeit(lambda: [w in words for w in probes], number=repeat)
+    member_store = timeit(lambda: [w in store for w in probes], number=repeat)
+    per = repeat * len(probes)
+    print(f"membership: tuple {member_tuple / per * 1e6:.2f}us, "
+          f"store {member_store / per * 1e6:.2f}us")
+
+    query = ("?a??e?", "r", "st")
+    scan = timeit(lambda: _tuple_query(words, *query), number=repeat)
+    walk = timeit(lambda: list(store.query(*query)), number=repeat)
+    print(f"query {query}: tuple {scan / repeat * 1e3:.2f}ms, "
+          f"store {walk / repeat * 1e3:.2f}ms")
+
+
+if __name__ == "__main__":
+    report()
@@ -1,5 +1,6 @@
 from __future__ import annotations
-from typing import Optional
+from collections.abc import Mapping
+from typing import Iterator, Optional
 from a2_support import UserInterface, TextInterface
 from constants import *
 
@@ -12,6 +13,11 @@ MOVE_DAMAGE = 1
 HUNGER_CUMULATE = 1
 THIRST_CUMULATE = 1
 ITEM_ENTITY = (EMPTY, COIN, POTION, HONEY, APPLE, WATER)
+# IDs kept in a maze's row info; every other character becomes EMPTY
+ROW_INFO_IDS = (WALL, DOOR, LAVA, WATER, APPLE, HONEY, POTION)
+ROW_INFO_TABLE = str.maketrans(
+    {chr(code): EMPTY for code in range(128) if chr(code) not in ROW_INFO_IDS}
+)
 FILE_PROMPT = 'Enter game file: '
 MOVE_PROMPT = 'Enter a move: '
 
@@ -28,6 +34,32 @@ __version__ = 1.0
 # to attempt the Model class.
 
 
+def iter_levels(filename: str) -> Iterator['Level']:
+    """ Reads a game file one line at a time, yielding each level as soon as
+        its last row has been read, so only one level is held at a time.
+
+    Args:
+        filename (str): The path to the game file
+
+    Yields:
+        Each Level instance in the game, in order
+    """
+    level = None
+    with open(filename, 'r') as file:
+        for line in file:
+            line = line.strip()
+            if line.startswith('Maze'):
+                if level is not None:
+                    yield level
+                _, _, dimensions = line[5:].partition(' - ')
+                dimensions = [int(item) for item in dimensions.split()]
+                level = Level(dimensions)
+            elif len(line) > 0 and level is not None:
+                level.add_row(line)
+    if level is not None:
+        yield level
+
+
 def load_game(filename: str) -> list['Level']:
     """ Reads a game file and creates a list of all the levels in order.
     
@@ -37,17 +69,7 @@ def load_game(filename: str) -> list['Level']:
     Returns:
         A list of all Level instances to play in the game
     """
-    levels = []
-    with open(filename, 'r') as file:
-        for line in file:
-            line = line.strip()
-            if line.startswith('Maze'):
-                _, _, dimensions = line[5:].partition(' - ')
-                dimensions = [int(item) for item in dimensions.split()]
-                levels.append(Level(dimensions))
-            elif len(line) > 0 and len(levels) > 0:
-                levels[-1].add_row(line)
-    return levels
+    return list(iter_levels(filename))
 
 
 # Write your classes here
@@ -220,6 +242,8 @@ class Entity(object):
     Attributes:
         This class has no public attributes
     """
+    __slots__ = ('_position',)
+
     def __init__(self, position: tuple[int, int]) -> None:
         """ Sets up this entity at the given (row, column) position.
 
@@ -274,6 +298,8 @@ class DynamicEntity(Entity):
     Attributes:
         This class has no public attributes
     """
+    __slots__ = ()
+
     def set_position(self, new_position: tuple[int, int]) -> None:
         """ Updates the DynamicEntity’s position to new_position, assuming it
             is a valid position.
@@ -304,6 +330,8 @@ class Player(DynamicEntity):
     Attributes:
         This class has no public attributes
     """
+    __slots__ = ('_hunger', '_thirst', '_health', '_player_inventory')
+
     def __init__(self, position) -> None:
         """ Sets up the player at the given (row, column) position.
 
@@ -388,6 +416,8 @@ class Item(Entity):
     Attributes:
         This class has no public attributes
     """
+    __slots__ = ()
+
     def apply(self, player: Player) -> None:
         """ Applies the items effect, if any, to the given player.
 
@@ -413,6 +443,8 @@ class Potion(Item):
     Attributes:
         This class has no public attributes
     """
+    __slots__ = ()
+
     def apply(self, player: Player) -> None:
         """ Applied item effect: Health is restored by 20, if any, for a given
             player.
@@ -441,6 +473,8 @@ class Coin(Item):
     Attributes:
         This class has no public attributes
     """
+    __slots__ = ()
+
     def apply(self, player: Player) -> None:
         """ The act of adding the coin to the players inventory is not done
             within this class, so we just left the apply method.
@@ -467,6 +501,8 @@ class Water(Item):
     Attributes:
         This class has no public attributes
     """
+    __slots__ = ()
+
     def apply(self, player: Player) -> None:
         """ Applied item effect: Thirst is restored by 5, if any, for a given
             player.
@@ -495,6 +531,8 @@ class Food(Item):
         Attributes:
             This class has no public attributes
     """
+    __slots__ = ()
+
     def apply(self, player: Player) -> None:
         """ Food is an abstract class, so we just left the apply method.
 
@@ -520,6 +558,8 @@ class Apple(Food):
     Attributes:
         This class has no public attributes
     """
+    __slots__ = ()
+
     def apply(self, player: Player) -> None:
         """ Applied item effect: Hunger is restored by 1, if any, for a given
             player.
@@ -546,6 +586,8 @@ class Honey(Food):
     Attributes:
         This class has no public attributes
     """
+    __slots__ = ()
+
     def apply(self, player: Player) -> None:
         """ Applied item effect: Hunger is restored by 5, if any, for a given
             player.
@@ -565,6 +607,48 @@ class Honey(Food):
         return HONEY
 
 
+# Item classes by the ID used for them in game files
+ITEM_CLASSES = {
+    COIN: Coin,
+    POTION: Potion,
+    HONEY: Honey,
+    APPLE: Apple,
+    WATER: Water,
+}
+
+
+class _InventoryItems(Mapping):
+    """ A read-only view of an Inventory as a mapping from item names to lists
+        of the items with that name. Each list is built when it is looked up,
+        from the inventory's current counts.
+
+    Attributes:
+        This class has no public attributes
+    """
+    def __init__(self, counts: dict[str, int],
+                 instances: dict[str, Item]) -> None:
+        """ Sets up a view of an inventory's counts and item instances.
+
+        Args:
+            counts (dict[str, int]): The number of each item, by name
+            instances (dict[str, Item]): An instance of each item, by name
+        """
+        self._counts = counts
+        self._instances = instances
+
+    def __getitem__(self, item_name: str) -> list[Item, ...]:
+        return [self._instances[item_name]] * self._counts[item_name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._counts)
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+
 class Inventory(object):
     """ An Inventory contains and manages a collection of items.
 
@@ -580,14 +664,14 @@ class Inventory(object):
         self._ini_items = initial_items
         self._info = ''
 
-        # If no initial_items is provided, inventory starts with an empty
-        # dictionary for the items.
-        self._inventory: dict[str, list[str]] = {}
+        # Items are stateless, so only the number of each item is kept,
+        # mapped from its name, with the first instance added of each name.
+        self._counts: dict[str, int] = {}
+        self._instances: dict[str, Item] = {}
+        self._view = _InventoryItems(self._counts, self._instances)
 
-        # Otherwise, the initial dictionary is set up from the initial_items
-        # list to be a dictionary mapping item names to a list of item
-        # instances with that name.
-        if len(initial_items) != 0:
+        # The counts are set up from the initial_items list, if provided.
+        if initial_items:
             for items in self._ini_items:
                 self.add_item(items)
 
@@ -597,17 +681,33 @@ class Inventory(object):
         Args:
             item (Item): The item to be added to Inventory instance
         """
-        class_type, _, _ = item.__repr__().split('(')
-        if class_type in self._inventory.keys():
-            self._inventory[class_type].append(item)
-        else:
-            self._inventory[class_type] = [item]
+        self.add_many(item, 1)
+
+    def add_many(self, item: Item, amount: int) -> None:
+        """ Adds amount of the given item to this inventory.
 
-    def get_items(self) -> dict[str, list[Item, ...]]:
+        Args:
+            item (Item): The item to be added to Inventory instance
+            amount (int): How many of the item to add
+        """
+        if amount < 0:
+            raise ValueError(f"cannot add {amount} items")
+        if amount:
+            name = item.get_name()
+            self._instances.setdefault(name, item)
+            self._counts[name] = self._counts.get(name, 0) + amount
+
+    def count(self, item_name: str) -> int:
+        """ Returns how many of the item with the given name are in this
+            inventory."""
+        return self._counts.get(item_name, 0)
+
+    def get_items(self) -> Mapping[str, list[Item, ...]]:
         """ Returns a dictionary mapping the names of all items in the
             inventory to lists containing each instance of the item with
-            that name."""
-        return self._inventory
+            that name. The mapping is a read-only view that follows later
+            changes to the inventory."""
+        return self._view
 
     def remove_item(self, item_name: str) -> Optional[Item]:
         """ Removes the first instance of the item with the given
@@ -621,23 +721,42 @@ class Inventory(object):
             from the inventory. If no item exists in the inventory with the
             given name, then this method returns None.
         """
-        if item_name not in self._inventory.keys():
-            return None
-        else:
-            removed = self._inventory[item_name][0]
+        removed = self._instances.get(item_name)
+        if removed is not None:
+            self.remove_many(item_name, 1)
+        return removed
+
+    def remove_many(self, item_name: str, amount: int) -> bool:
+        """ Removes amount instances of the item with the given item_name from
+            the inventory, if there are that many. Otherwise nothing is
+            removed.
 
-            # Remove the first value of given item_name, if no value exists
-            # after deletion, delete the key
-            self._inventory[item_name] = self._inventory[item_name][1:]
-            if not self._inventory[item_name]:
-                self._inventory.pop(item_name)
-            return removed
+        Args:
+            item_name (str): The name of item needs to be removed
+            amount (int): How many of the item to remove
+
+        Returns:
+            Return True if the items were removed, else False.
+        """
+        if amount < 0:
+            raise ValueError(f"cannot remove {amount} items")
+        count = self._counts.get(item_name, 0)
+        if count < amount:
+            return False
+
+        # If no item of the given name is left, delete its count
+        if count == amount:
+            self._counts.pop(item_name, None)
+            self._instances.pop(item_name, None)
+        else:
+            self._counts[item_name] = count - amount
+        return True
 
     def __str__(self):
         """ Returns a string containing information about quantities of items
             available in the inventory."""
-        for items in self._inventory:
-            self._info += f'{items}: {len(self._inventory[items])}\n'
+        for items in self._counts:
+            self._info += f'{items}: {self._counts[items]}\n'
         return self._info.strip('\n')
 
     def __repr__(self):
@@ -665,7 +784,9 @@ class Maze(object):
                                             of this maze.
         """
         self._dimension = dimensions
-        self._row_info = ''
+        # Rows not yet joined into self._row_info, which is built on demand
+        self._row_parts = []
+        self._row_info = None
         self._tiles = []
         self._door = Door()
 
@@ -681,30 +802,27 @@ class Maze(object):
         Args:
             row (str): The collection string of tile IDs in a row
         """
-        for ID in row:
-            if ID not in (WALL, DOOR, LAVA, WATER, APPLE, HONEY, POTION):
-                self._row_info += EMPTY
-            else:
-                self._row_info += ID
-        self._row_info += '\n'
-
-        # Each time add_row is called, we need to reassign to null to prevent
-        # self._tiles from retaining the contents of the previous call
-        processed = []
-        self._tiles = []
-        for ID in self._row_info:
-            if ID == WALL:
-                processed.append(Wall())
-            elif ID == DOOR:
-                processed.append(self._door)
-            elif ID == '\n':
-                self._tiles.append(processed)
-                processed = []
-            else:
-                processed.append(Empty())
+        info = row.translate(ROW_INFO_TABLE)
+        if not info.isascii():
+            info = ''.join(ID if ID in ROW_INFO_IDS else EMPTY for ID in info)
+
+        # Keep any edits made to the joined row info, then add this row
+        if self._row_info is not None:
+            self._row_parts = [self._row_info]
+            self._row_info = None
+        self._row_parts.append(info + '\n')
+
+        # Only this row's tiles are built; earlier rows are left as they are
+        self._tiles.append([
+            self._door if ID == DOOR else Wall() if ID == WALL else Empty()
+            for ID in info
+        ])
 
     def get_row_info(self) -> str:
         """ returns the row info which have been added to this maze"""
+        if self._row_info is None:
+            self._row_info = ''.join(self._row_parts)
+            self._row_parts = []
         return self._row_info
 
     def get_tiles(self) -> list[list[Tile]]:
@@ -726,7 +844,7 @@ class Maze(object):
 
     def __str__(self):
         """ Returns the string representation of this maze."""
-        return self._row_info.strip('\n')
+        return self.get_row_info().strip('\n')
 
     def __repr__(self):
         """ Returns a string that could be copied and pasted to construct a
@@ -772,24 +890,13 @@ class Level(object):
             row (str): The collection string of tile IDs in a row.
         """
         self.get_maze().add_row(row)
+        row_num = self._call_time
         for idx, ID in enumerate(row):
-            if ID == COIN:
-                self._items[(self._call_time, idx)] = \
-                    Coin((self._call_time, idx))
-            elif ID == POTION:
-                self._items[(self._call_time, idx)] = \
-                    Potion((self._call_time, idx))
-            elif ID == HONEY:
-                self._items[(self._call_time, idx)] = \
-                    Honey((self._call_time, idx))
-            elif ID == APPLE:
-                self._items[(self._call_time, idx)] = \
-                    Apple((self._call_time, idx))
-            elif ID == WATER:
-                self._items[(self._call_time, idx)] = \
-                    Water((self._call_time, idx))
+            item_class = ITEM_CLASSES.get(ID)
+            if item_class is not None:
+                self._items[(row_num, idx)] = item_class((row_num, idx))
             elif ID == PLAYER:
-                self._player = Player((self._call_time, idx))
+                self._player = Player((row_num, idx))
 
         self._call_time += 1
 
@@ -812,23 +919,13 @@ class Level(object):
                     temp_row += ' '
             self.add_row(temp_row)
 
-        if self._level.get_tile(position).get_id() in ITEM_ENTITY:
+        item_class = ITEM_CLASSES.get(entity_id)
+        if (self._level.get_tile(position).get_id() in ITEM_ENTITY
+                and item_class is not None):
             row, column = position
-            if entity_id == COIN:
-                self._level.get_tiles()[row][column] = Coin(position)
-                self._items[position] = Coin(position)
-            elif entity_id == POTION:
-                self._level.get_tiles()[row][column] = Potion(position)
-                self._items[position] = Potion(position)
-            elif entity_id == HONEY:
-                self._level.get_tiles()[row][column] = Honey(position)
-                self._items[position] = Honey(position)
-            elif entity_id == APPLE:
-                self._level.get_tiles()[row][column] = Apple(position)
-                self._items[position] = Apple(position)
-            elif entity_id == WATER:
-                self._level.get_tiles()[row][column] = Water(position)
-                self._items[position] = Water(position)
+            item = item_class(position)
+            self._level.get_tiles()[row][column] = item
+            self._items[position] = item
 
     def get_dimensions(self) -> tuple[int, int]:
         """ Returns the (#rows, #columns) in the level maze."""
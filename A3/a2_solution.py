@@ -1,5 +1,16 @@
 from __future__ import annotations
-from typing import Optional
+import hashlib
+import mmap
+import os
+import re
+import shutil
+import struct
+import zlib
+from array import array
+from bisect import bisect_right
+from collections.abc import Mapping
+from itertools import islice
+from typing import Iterable, Iterator, Optional
 from a2_support import UserInterface, TextInterface
 from constants import *
 
@@ -74,9 +85,15 @@ class Door(Tile):
         self._blocking = False
 
 
+# Shared instances returned by Maze.get_tile, indexed by tile code
+TILE_FLYWEIGHTS = (Empty(), Wall(), Lava(), Door())
+UNLOCKED_DOOR = Door()
+UNLOCKED_DOOR.unlock()
+
 
 class Entity:
     """ Abstract base class for any entity."""
+    __slots__ = ('_position',)
     _id = 'E'
     def __init__(self, position: tuple[int, int]) -> None:
         """Sets up the entity at the provided location.
@@ -109,6 +126,7 @@ class Entity:
 
 class Item(Entity):
     """ Abstract class providing an interface for all items in the game. """
+    __slots__ = ()
     _id = ITEM
 
     def apply(self, player: 'Player') -> None:
@@ -122,6 +140,7 @@ class Item(Entity):
 
 class Potion(Item):
     """ A potion restores the players HP by 20 when applied. """
+    __slots__ = ()
     _id = POTION
 
     def apply(self, player: 'Player') -> None:
@@ -131,6 +150,7 @@ class Potion(Item):
 
 class Coin(Item):
     """ Coins are collected by the player to allow the door to be unlocked. """
+    __slots__ = ()
     _id = COIN
 
     def apply(self, player: 'Player') -> None:
@@ -143,6 +163,7 @@ class Food(Item):
         food item decreases the player's hunger by a set amount depending on the
         type of food.
     """
+    __slots__ = ()
     _id = FOOD
     _amount = 0
 
@@ -153,18 +174,21 @@ class Food(Item):
 
 class Apple(Food):
     """ Apples decrease the players hunger by 1. """
+    __slots__ = ()
     _id = APPLE
     _amount = APPLE_AMOUNT
 
 
 class Honey(Food):
     """ Honey decreases the players hunger by 5. """
+    __slots__ = ()
     _id = HONEY
     _amount = HONEY_AMOUNT
 
 
 class Water(Item):
     """ Water decreases the player's thirst by 5. """
+    __slots__ = ()
     _id = WATER
 
     def apply(self, player: 'Player') -> None:
@@ -172,8 +196,34 @@ class Water(Item):
         player.change_thirst(WATER_AMOUNT)
 
 
+class _InventoryItems(Mapping):
+    """ A read-only view of an inventory as a mapping from item names to
+        lists of the items with that name. Each list is built when it is
+        looked up, from the inventory's current counts.
+    """
+    def __init__(self, counts: dict[str, int], instances: dict[str, Item]
+                 ) -> None:
+        """ Sets up a view of an inventory's counts and item instances. """
+        self._counts = counts
+        self._instances = instances
+
+    def __getitem__(self, item_name: str) -> list[Item]:
+        return [self._instances[item_name]] * self._counts[item_name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._counts)
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+
 class Inventory:
-    """ A collection of items. """
+    """ A collection of items. Items are stateless, so only the number of
+        each is kept, with the first instance added of each name.
+    """
     def __init__(self, initial_items: Optional[list[Item]] = None) -> None:
         """ Sets up this inventory with the initial items (if provided). Else
             sets up a new empty inventory.
@@ -181,7 +231,9 @@ class Inventory:
         Parameters:
             initial_items: An optional list of initial items to put in inventory
         """
-        self._items = {}
+        self._counts = {} # Maps item names to how many of the item there are
+        self._instances = {} # Maps item names to an instance of the item
+        self._view = _InventoryItems(self._counts, self._instances)
         if initial_items is not None:
             for item in initial_items:
                 self.add_item(item)
@@ -192,15 +244,34 @@ class Inventory:
         Parameters:
             item: The item to add
         """
-        items = self._items.get(item.get_name(), [])
-        items.append(item)
-        self._items[item.get_name()] = items
+        self.add_many(item, 1)
 
-    def get_items(self) -> dict[str, list[Item]]:
+    def add_many(self, item: Item, amount: int) -> None:
+        """ Adds amount of the given item to the inventory.
+
+        Parameters:
+            item: The item to add
+            amount: How many of the item to add
+        """
+        if amount < 0:
+            raise ValueError(f"cannot add {amount} items")
+        if amount:
+            name = item.get_name()
+            self._instances.setdefault(name, item)
+            self._counts[name] = self._counts.get(name, 0) + amount
+
+    def count(self, item_name: str) -> int:
+        """ Returns how many of the item with the given name are in the
+            inventory.
+        """
+        return self._counts.get(item_name, 0)
+
+    def get_items(self) -> Mapping[str, list[Item]]:
         """ Returns the a dictionary mapping item names to the instances of the
-            item with that name in the inventory.
+            item with that name in the inventory. The mapping is a read-only
+            view that follows later changes to the inventory.
         """
-        return self._items
+        return self._view
 
     def remove_item(self, item_name: str) -> Optional['Item']:
         """ Removes one instance of the item with the given name from inventory,
@@ -213,23 +284,42 @@ class Inventory:
             The removed item, if one exists, else None.
 
         """
-        items = self._items.get(item_name)
-        if items is None or items == []:
-            return None
+        item = self._instances.get(item_name)
+        if item is not None:
+            self.remove_many(item_name, 1)
+        return item
+
+    def remove_many(self, item_name: str, amount: int) -> bool:
+        """ Removes amount instances of the item with the given name from the
+            inventory, if there are that many. Otherwise nothing is removed.
+
+        Parameters:
+            item_name: The name of the item to remove.
+            amount: How many of the item to remove.
+
+        Returns:
+            True iff the items were removed.
+        """
+        if amount < 0:
+            raise ValueError(f"cannot remove {amount} items")
+        count = self._counts.get(item_name, 0)
+        if count < amount:
+            return False
+        if count == amount:
+            self._counts.pop(item_name, None)
+            self._instances.pop(item_name, None)
         else:
-            item = items.pop(0)
-            if self._items.get(item_name) == []:
-                del self._items[item_name]
-            return item
+            self._counts[item_name] = count - amount
+        return True
     
     def __str__(self):
-        text = [f'{name}: {len(items)}' for name, items in self._items.items()]
+        text = [f'{name}: {count}' for name, count in self._counts.items()]
         return '\n'.join(text)
     
     def __repr__(self):
         items = []
-        for name in self._items:
-            items.extend(self._items.get(name))
+        for name, count in self._counts.items():
+            items.extend([self._instances[name]] * count)
         return f'Inventory(initial_items={items})'
 
 
@@ -239,6 +329,7 @@ class DynamicEntity(Entity):
 
         Note: they'll extend this in A3 to have direction and an Enemy subclass.
     """
+    __slots__ = ()
     _id = DYNAMIC_ENTITY
     
     def set_position(self, new_position: tuple[int, int]) -> None:
@@ -252,6 +343,7 @@ class DynamicEntity(Entity):
 
 class Player(DynamicEntity):
     """ The player in the game. """
+    __slots__ = ('_health', '_hunger', '_thirst', '_inventory')
     _id = PLAYER
 
     def __init__(self, position: tuple[int, int]) -> None:
@@ -329,6 +421,304 @@ class Player(DynamicEntity):
         return self._inventory
 
 
+# A row starting with RUN_LENGTH_ROW is written as runs: a count then the ID
+# repeated, e.g. '=12#3 C' for 12 walls, 3 empty cells and a coin. A missing
+# count means 1, and trailing empty cells may be left out as in plain rows.
+RUN_LENGTH_ROW = '='
+_RUN_LENGTH = re.compile(r'(\d*)(\D)')
+_RUN_LENGTH_ROW = re.compile(r'(?:\d*\D)*')
+
+
+def expand_runs(row: str) -> str:
+    """ Returns the plain form of a row written as runs.
+
+    Parameters:
+        row: The runs of the row, after its RUN_LENGTH_ROW marker.
+
+    Raises:
+        ValueError: if row is not a sequence of runs, e.g. it ends in a count
+                    with no tile after it.
+    """
+    if _RUN_LENGTH_ROW.fullmatch(row) is None:
+        raise ValueError(f"malformed run length row {row!r}")
+    return ''.join(
+        char * int(count or 1) for count, char in _RUN_LENGTH.findall(row)
+    )
+
+
+def encode_runs(row: str) -> str:
+    """ Returns row written as runs, with its RUN_LENGTH_ROW marker. """
+    runs = [RUN_LENGTH_ROW]
+    for run in re.finditer(r'(.)\1*', row.rstrip()):
+        length = run.end() - run.start()
+        runs.append((str(length) if length > 1 else '') + run.group(1))
+    return ''.join(runs)
+
+
+def _parse_level(lines: Iterable[str]) -> Optional['Level']:
+    """ Builds the level described by a header line and its rows.
+
+    Parameters:
+        lines: The lines of one level, starting with its 'Maze' header.
+
+    Returns:
+        The level, or None if lines has no header.
+    """
+    level = None
+    for line in lines:
+        line = line.strip()
+        if line.startswith('Maze'):
+            _, _, dimensions = line[5:].partition(' - ')
+            dimensions = [int(item) for item in dimensions.split()]
+            level = Level(dimensions)
+        elif len(line) > 0 and level is not None:
+            if line.startswith(RUN_LENGTH_ROW):
+                line = expand_runs(line[1:])
+            level.add_row(line)
+    return level
+
+
+# Names the directory Model keeps compiled levels in when not given one
+LEVEL_CACHE_VARIABLE = 'MAZERUNNER_LEVEL_CACHE'
+
+
+class LevelIndex:
+    """ The byte offset of every level in a game file, found with one scan of
+        the file, so that each level can be parsed only when it is needed.
+    """
+    # Header lines, as load_game recognises them
+    HEADER = re.compile(rb'^[ \t\r\f\v]*Maze', re.MULTILINE)
+    # Files at least this large are scanned through mmap
+    MMAP_THRESHOLD = 1 << 20
+
+    def __init__(
+        self, filename: str, offsets: Optional[list[int]] = None
+    ) -> None:
+        """ Scans filename for level headers.
+
+        Parameters:
+            filename: The path to the game file
+            offsets: The offsets of each level header followed by the file
+                     size, from an earlier scan of the same file; if given,
+                     the file is not scanned again.
+        """
+        self._filename = filename
+        self._offsets = offsets if offsets is not None else self._scan()
+
+    def _scan(self) -> list[int]:
+        """ Returns the offset of each level header followed by the file size.
+        """
+        with open(self._filename, 'rb') as file:
+            size = os.fstat(file.fileno()).st_size
+            if size >= self.MMAP_THRESHOLD:
+                with mmap.mmap(
+                    file.fileno(), 0, access=mmap.ACCESS_READ
+                ) as data:
+                    matches = self.HEADER.finditer(data)
+                    starts = [match.start() for match in matches]
+            else:
+                matches = self.HEADER.finditer(file.read())
+                starts = [match.start() for match in matches]
+        return starts + [size]
+
+    def get_offsets(self) -> list[int]:
+        """ Returns the offset of each level header followed by the file size.
+        """
+        return self._offsets
+
+    def __len__(self) -> int:
+        """ Returns the number of levels in the file. """
+        return len(self._offsets) - 1
+
+    def load_level(self, level_num: int) -> 'Level':
+        """ Reads and parses one level.
+
+        Parameters:
+            level_num: The position of the level in the file, from 0.
+        """
+        if not 0 <= level_num < len(self):
+            raise IndexError(f"{self._filename} has no level {level_num}")
+        start, end = self._offsets[level_num], self._offsets[level_num + 1]
+        with open(self._filename, 'rb') as file:
+            file.seek(start)
+            text = file.read(end - start).decode()
+        return _parse_level(text.splitlines())
+
+
+class CompiledLevelIndex(LevelIndex):
+    """ A LevelIndex that keeps a compiled binary copy of each level it
+        parses, so later games from the same file skip the text parse.
+
+        Compiled files live in a directory, inside a cache directory chosen by
+        the caller, named after the game file and the hash of its contents,
+        so a changed game file is never read from a stale copy. The
+        directory holds 'index' and one file per level:
+            index: INDEX_MAGIC, #offsets, CRC32 of the offsets, then the
+                   offsets as uint64
+            header: LEVEL_MAGIC, #rows, #columns, #rows added, player start
+                    row and column (-1 if none), #items, CRC32 of the rest
+            tile codes, one byte per cell, row major
+            item positions, a pair of uint32 per item
+            item IDs, one ASCII byte per item
+        Missing, stale or corrupt files are rebuilt from the game file.
+    """
+    INDEX_MAGIC = b'MZI2'
+    LEVEL_MAGIC = b'MZL1'
+    INDEX_HEADER = struct.Struct('<4sII')
+    LEVEL_HEADER = struct.Struct('<4sIIIiiII')
+    # Bytes of the game file hashed at a time
+    HASH_CHUNK = 1 << 16
+
+    def __init__(self, filename: str, cache_dir: str) -> None:
+        """ Opens the compiled copy of filename, scanning the file if there
+            is no usable index yet.
+
+        Parameters:
+            filename: The path to the game file
+            cache_dir: Where compiled levels are kept. Compiled copies of
+                       earlier versions of the game file in it are deleted.
+        """
+        with open(filename, 'rb') as file:
+            size = os.fstat(file.fileno()).st_size
+            hasher = hashlib.sha256()
+            for chunk in iter(lambda: file.read(self.HASH_CHUNK), b''):
+                hasher.update(chunk)
+        digest = hasher.hexdigest()
+        prefix = os.path.basename(filename) + '-'
+        self._directory = os.path.join(cache_dir, prefix + digest)
+
+        offsets = self._read_index(size)
+        super().__init__(filename, offsets)
+        if offsets is None:
+            self._remove_stale(cache_dir, prefix)
+            body = array('Q', self._offsets).tobytes()
+            self._write('index', self.INDEX_HEADER.pack(
+                self.INDEX_MAGIC, len(self._offsets), zlib.crc32(body)
+            ) + body)
+
+    def _read(self, name: str) -> Optional[bytes]:
+        """ Returns the contents of a compiled file, or None if unreadable. """
+        try:
+            with open(os.path.join(self._directory, name), 'rb') as file:
+                return file.read()
+        except OSError:
+            return None
+
+    def _write(self, name: str, data: bytes) -> None:
+        """ Replaces a compiled file. Failing to write only loses the cache.
+        """
+        path = os.path.join(self._directory, name)
+        # Games running in other processes may be writing the same file
+        temp_path = f'{path}.{os.getpid()}.tmp'
+        try:
+            os.makedirs(self._directory, exist_ok=True)
+            with open(temp_path, 'wb') as file:
+                file.write(data)
+            os.replace(temp_path, path)
+        except OSError:
+            pass
+
+    def _remove_stale(self, cache_dir: str, prefix: str) -> None:
+        """ Deletes compiled copies of earlier versions of the game file. """
+        try:
+            names = os.listdir(cache_dir)
+        except OSError:
+            return
+        for name in names:
+            path = os.path.join(cache_dir, name)
+            if name.startswith(prefix) and path != self._directory:
+                shutil.rmtree(path, ignore_errors=True)
+
+    def _read_index(self, size: int) -> Optional[list[int]]:
+        """ Returns the cached level offsets, or None if they are unusable.
+
+        Parameters:
+            size: The size of the game file, which must be the last offset.
+        """
+        data = self._read('index')
+        try:
+            magic, count, checksum = self.INDEX_HEADER.unpack_from(data or b'')
+        except struct.error:
+            return None
+        offsets = array('Q')
+        body = data[self.INDEX_HEADER.size:]
+        if (magic != self.INDEX_MAGIC or count == 0
+                or len(body) != count * offsets.itemsize
+                or zlib.crc32(body) != checksum):
+            return None
+        offsets.frombytes(body)
+        offsets = offsets.tolist()
+        if offsets[-1] != size or any(
+            start >= end for start, end in zip(offsets, offsets[1:])
+        ):
+            return None
+        return offsets
+
+    def load_level(self, level_num: int) -> 'Level':
+        """ Loads one level from its compiled copy, or parses it and compiles
+            it if there is no valid copy.
+
+        Parameters:
+            level_num: The position of the level in the file, from 0.
+        """
+        if not 0 <= level_num < len(self):
+            raise IndexError(f"{self._filename} has no level {level_num}")
+        name = f'{level_num}.lvl'
+        level = self._decode(self._read(name))
+        if level is None:
+            level = super().load_level(level_num)
+            if level is not None:
+                self._write(name, self._encode(level))
+        return level
+
+    def _encode(self, level: 'Level') -> bytes:
+        """ Returns the compiled form of level. """
+        maze = level.get_maze()
+        num_rows, num_cols = level.get_dimensions()
+        codes = maze.get_codes()
+        items = level.get_items()
+        positions = array('I', [i for position in items for i in position])
+        ids = ''.join(item.get_id() for item in items.values()).encode()
+        start = level.get_player_start() or (-1, -1)
+        body = codes + positions.tobytes() + ids
+        header = self.LEVEL_HEADER.pack(
+            self.LEVEL_MAGIC, num_rows, num_cols,
+            len(codes) // max(num_cols, 1), start[0], start[1], len(items),
+            zlib.crc32(body)
+        )
+        return header + body
+
+    def _decode(self, data: Optional[bytes]) -> Optional['Level']:
+        """ Returns the level compiled in data, or None if data is not a
+            valid compiled level.
+        """
+        try:
+            header = self.LEVEL_HEADER.unpack_from(data or b'')
+        except struct.error:
+            return None
+        magic, num_rows, num_cols, rows_added, start_row, start_col, \
+            num_items, checksum = header
+        body = memoryview(data)[self.LEVEL_HEADER.size:]
+        num_codes = rows_added * num_cols
+        positions = array('I')
+        positions_size = 2 * num_items * positions.itemsize
+        if (magic != self.LEVEL_MAGIC
+                or len(body) != num_codes + positions_size + num_items
+                or zlib.crc32(body) != checksum):
+            return None
+
+        level = Level([num_rows, num_cols])
+        level.add_coded_rows(bytes(body[:num_codes]))
+        positions.frombytes(body[num_codes:num_codes + positions_size])
+        ids = bytes(body[num_codes + positions_size:]).decode()
+        for i, entity_id in enumerate(ids):
+            level.add_entity((positions[2 * i], positions[2 * i + 1]),
+                             entity_id)
+        if start_row >= 0:
+            level.add_player_start((start_row, start_col))
+        return level
+
+
 def load_game(filename: str) -> list['Level']:
     """ Reads a game file and creates a list of all the levels in order.
     
@@ -338,27 +728,95 @@ def load_game(filename: str) -> list['Level']:
     Returns:
         A list of all Level instances to play in the game
     """
-    levels = []
-    with open(filename, 'r') as file:
-        for line in file:
-            line = line.strip()
-            if line.startswith('Maze'):
-                _, _, dimensions = line[5:].partition(' - ')
-                dimensions = [int(item) for item in dimensions.split()]
-                levels.append(Level(dimensions))
-            elif len(line) > 0 and len(levels) > 0:
-                levels[-1].add_row(line)
-    return levels
+    index = LevelIndex(filename)
+    return [index.load_level(level_num) for level_num in range(len(index))]
+
+
+# Tile codes stored by Maze, one byte per cell
+EMPTY_CODE, WALL_CODE, LAVA_CODE, DOOR_CODE = range(4)
+
+
+def _code_table(codes: dict[str, int], default: int) -> bytes:
+    """ Returns a bytes.translate table mapping each character id in codes to
+        its code, and every other byte to default.
+    """
+    table = bytearray([default]) * 256
+    for char, code in codes.items():
+        table[ord(char)] = code
+    return bytes(table)
+
+
+class _RunRow:
+    """ A row of tile codes stored as runs: the column after the end of each
+        run and the code of its cells. Indexing finds the run with a binary
+        search, and the row converts to bytes like the plain rows it stands
+        in for.
+    """
+    __slots__ = ('_ends', '_codes')
+
+    def __init__(self, ends: array, codes: bytes) -> None:
+        """ Sets up a row from its runs.
+
+        Parameters:
+            ends: The column just past each run, increasing.
+            codes: The tile code of each run.
+        """
+        self._ends = ends
+        self._codes = codes
+
+    def __getitem__(self, col: int) -> int:
+        """ Returns the tile code at column col, from 0. """
+        return self._codes[bisect_right(self._ends, col)]
+
+    def __len__(self) -> int:
+        """ Returns the number of cells in the row. """
+        return self._ends[-1] if self._ends else 0
+
+    def __bytes__(self) -> bytes:
+        """ Returns the code of every cell in the row. """
+        start = 0
+        runs = []
+        for end, code in zip(self._ends, self._codes):
+            runs.append(bytes([code]) * (end - start))
+            start = end
+        return b''.join(runs)
+
 
 class Maze:
     """ Models a single map for one level. Only includes ground information,
-        excluding information about entities. """
+        excluding information about entities.
+
+        Tiles are stored as one byte code per cell, a bytes object per row.
+        Rows that are mostly long runs of one tile are stored as a _RunRow
+        instead, so large sparse mazes take a fraction of the memory.
+        Stateless tiles are shared singletons, and the unlocked doors are
+        kept in a set on the maze, so get_tile returns one of a fixed set of
+        instances. Tiles it returns must not be changed; use unlock_door.
+        The position of every door is indexed as rows are added, so unlocking
+        touches only the doors.
+    """
     TILES = {
         WALL: Wall,
         EMPTY: Empty,
         DOOR: Door,
         LAVA: Lava,
     }
+    CODES = {
+        EMPTY: EMPTY_CODE,
+        WALL: WALL_CODE,
+        LAVA: LAVA_CODE,
+        DOOR: DOOR_CODE,
+    }
+    # If there is an entity in a spot, assume the ground underneath is empty
+    _TRANSLATION = _code_table(CODES, EMPTY_CODE)
+    _IDS = _code_table({chr(code): ord(char) for char, code in CODES.items()},
+                       ord(EMPTY))
+    # A run of one code; alternatives of one byte each match far faster
+    # than a backreference
+    _RUN = re.compile(b'|'.join(re.escape(bytes([code])) + b'+'
+                                for code in CODES.values()))
+    # Rows with at least this many cells per run are stored as runs
+    MIN_RUN_LENGTH = 8
 
     def __init__(self, dimensions: tuple[int, int]) -> None:
         """Sets up an empty maze of given dimensions.
@@ -367,11 +825,30 @@ class Maze:
             dimensions: (#rows, #columns)
         """
         self._dimensions = dimensions
-        self._tiles = []
+        self._rows = []
+        self._doors = [] # (row, column) of each door
+        self._unlocked = set() # (row, column) of each unlocked door
     
     def get_dimensions(self) -> tuple[int, int]:
         """ Returns the dimensions of this maze. """
         return self._dimensions
+
+    def _add_codes(self, codes: bytes) -> None:
+        """ Adds one row of tile codes, as runs if it is sparse enough. """
+        row_num = len(self._rows)
+        col = codes.find(DOOR_CODE)
+        while col != -1:
+            self._doors.append((row_num, col))
+            col = codes.find(DOOR_CODE, col + 1)
+
+        max_runs = len(codes) // self.MIN_RUN_LENGTH
+        runs = islice(self._RUN.finditer(codes), max_runs + 1)
+        ends = array('I', [run.end() for run in runs])
+        if len(ends) > max_runs:
+            self._rows.append(codes)
+        else:
+            run_codes = bytes(codes[end - 1] for end in ends)
+            self._rows.append(_RunRow(ends, run_codes))
     
     def add_row(self, row: str) -> None:
         """ Adds a row of tiles to the maze.
@@ -379,21 +856,61 @@ class Maze:
         Parameters:
             row: String of the tile IDs from which to construct Tile instances.
         """
-        # If there is an entity in a spot, assume the ground underneath is empty
-        self._tiles.append([self.TILES.get(tile, Empty)() for tile in row])
+        num_cols = self._dimensions[1]
+        codes = row.encode('ascii', 'replace').translate(self._TRANSLATION)
+        self._add_codes(codes[:num_cols].ljust(num_cols, bytes([EMPTY_CODE])))
+
+    def add_coded_rows(self, codes: bytes) -> None:
+        """ Adds whole rows of tiles already translated to tile codes.
+
+        Parameters:
+            codes: The codes of one or more rows, as returned by get_codes.
+        """
+        num_cols = self._dimensions[1]
+        if num_cols == 0 or len(codes) % num_cols:
+            raise ValueError(f"codes do not fill rows of {num_cols} tiles")
+        for start in range(0, len(codes), num_cols):
+            self._add_codes(codes[start:start + num_cols])
+
+    def get_codes(self) -> bytes:
+        """ Returns the tile code of every cell, row by row. """
+        return b''.join(bytes(row) for row in self._rows)
+
+    def _position(self, position: tuple[int, int]) -> tuple[int, int]:
+        """ Returns position with negative indices resolved as a list of rows
+            would resolve them.
+        """
+        row, col = position
+        num_rows, num_cols = len(self._rows), self._dimensions[1]
+        if -num_rows <= row < 0:
+            row += num_rows
+        if -num_cols <= col < 0:
+            col += num_cols
+        if not (0 <= row < num_rows and 0 <= col < num_cols):
+            raise IndexError(f"{position} is outside the maze")
+        return row, col
+
+    def _tile_at(self, row: int, col: int) -> Tile:
+        """ Returns the shared tile instance for the cell at (row, col). """
+        code = self._rows[row][col]
+        if code == DOOR_CODE and (row, col) in self._unlocked:
+            return UNLOCKED_DOOR
+        return TILE_FLYWEIGHTS[code]
 
     def get_tiles(self) -> list[list[Tile]]:
         """ Returns the Tile instances in this maze. Each element is a row of
             Tile instances in order.
         """
-        return self._tiles
-    
+        num_cols = self._dimensions[1]
+        return [
+            [self._tile_at(row, col) for col in range(num_cols)]
+            for row in range(len(self._rows))
+        ]
+
     def unlock_door(self) -> None:
         """ Unlocks any doors that exist in the maze. """
-        for row in self._tiles:
-            for tile in row:
-                if isinstance(tile, Door):
-                    tile.unlock()
+        if len(self._unlocked) < len(self._doors):
+            self._unlocked.update(self._doors)
     
     def get_tile(self, position: tuple[int, int]) -> Tile:
         """ Returns the Tile instance at the given position.
@@ -401,20 +918,148 @@ class Maze:
         Parameters:
             position: The (row, column) position from which to find the tile.
         """
-        row, col = position
-        return self._tiles[row][col]
+        return self._tile_at(*self._position(position))
     
     def __str__(self) -> str:
         """ Returns the string representation of this maze. """
-        return '\n'.join(
-            [''.join([tile.get_id() for tile in row]) for row in self._tiles]
-        )
+        rows = [bytearray(bytes(row).translate(self._IDS))
+                for row in self._rows]
+        for row, col in self._unlocked:
+            rows[row][col] = ord(EMPTY)
+        return '\n'.join(row.decode('ascii') for row in rows)
     
     def __repr__(self) -> str:
         """ Returns the computer representation of this maze. """
         return f"Maze({self._dimensions})"
 
 
+class ItemIndex:
+    """ The positions of the items in a level, by item ID and by the square
+        bucket of the grid they fall in, so that items of one type or in one
+        area are found without looking at every item.
+    """
+    # Rows and columns covered by each bucket
+    BUCKET_SIZE = 32
+    # Types with at most this many items are searched directly by nearest
+    SCAN_LIMIT = 64
+
+    def __init__(self) -> None:
+        """ Sets up an empty index. """
+        self._positions = {} # Maps item IDs to the positions of those items
+        self._buckets = {} # Maps (item ID, bucket row, bucket column) to the
+                           # positions of those items in that bucket
+
+    def _bucket(self, entity_id: str, position: tuple[int, int]
+                ) -> tuple[str, int, int]:
+        """ Returns the key of the bucket holding position. """
+        return (entity_id, position[0] // self.BUCKET_SIZE,
+                position[1] // self.BUCKET_SIZE)
+
+    def add(self, position: tuple[int, int], entity_id: str) -> None:
+        """ Records an item at position.
+
+        Parameters:
+            position: The (row, column) position of the item.
+            entity_id: The ID of the item.
+        """
+        self._positions.setdefault(entity_id, set()).add(position)
+        bucket = self._bucket(entity_id, position)
+        self._buckets.setdefault(bucket, set()).add(position)
+
+    def remove(self, position: tuple[int, int], entity_id: str) -> None:
+        """ Forgets the item at position.
+
+        Parameters:
+            position: The (row, column) position of the item.
+            entity_id: The ID of the item.
+        """
+        self._positions[entity_id].discard(position)
+        bucket = self._bucket(entity_id, position)
+        positions = self._buckets[bucket]
+        positions.discard(position)
+        if not positions:
+            del self._buckets[bucket]
+
+    def count(self, entity_id: str) -> int:
+        """ Returns the number of items with the given ID. """
+        return len(self._positions.get(entity_id, ()))
+
+    def get_positions(self, entity_id: str) -> set[tuple[int, int]]:
+        """ Returns the positions of the items with the given ID. The set
+            must not be changed.
+        """
+        return self._positions.get(entity_id, set())
+
+    def in_rectangle(self, top_left: tuple[int, int],
+                     bottom_right: tuple[int, int]
+                     ) -> Iterable[tuple[int, int]]:
+        """ Yields the position of every item in a rectangle.
+
+        Parameters:
+            top_left: The (row, column) of the top left corner.
+            bottom_right: The (row, column) of the bottom right corner,
+                          included in the rectangle.
+        """
+        top, left = top_left
+        bottom, right = bottom_right
+        size = self.BUCKET_SIZE
+        for entity_id in self._positions:
+            for bucket_row in range(top // size, bottom // size + 1):
+                for bucket_col in range(left // size, right // size + 1):
+                    bucket = (entity_id, bucket_row, bucket_col)
+                    for row, col in self._buckets.get(bucket, ()):
+                        if top <= row <= bottom and left <= col <= right:
+                            yield row, col
+
+    def nearest(self, position: tuple[int, int], entity_id: str
+                ) -> Optional[tuple[int, int]]:
+        """ Returns the position of the item with the given ID that is the
+            fewest moves from position, ignoring walls, or None if there is
+            no such item. Ties are broken by the smaller position.
+
+        Parameters:
+            position: The (row, column) position to search from.
+            entity_id: The ID of the item to find.
+        """
+        positions = self.get_positions(entity_id)
+        row, col = position
+
+        def distance(other: tuple[int, int]) -> tuple[int, tuple[int, int]]:
+            return abs(other[0] - row) + abs(other[1] - col), other
+
+        if len(positions) <= self.SCAN_LIMIT:
+            return min(positions, key=distance, default=None)
+
+        # Search rings of buckets outwards; an item in ring n + 1 is more
+        # than n * BUCKET_SIZE moves away
+        _, centre_row, centre_col = self._bucket(entity_id, position)
+        size = self.BUCKET_SIZE
+        best = None
+        ring = 0
+        while True:
+            for bucket_row, bucket_col in self._ring(centre_row, centre_col,
+                                                     ring):
+                bucket = (entity_id, bucket_row, bucket_col)
+                for other in self._buckets.get(bucket, ()):
+                    if best is None or distance(other) < distance(best):
+                        best = other
+            if best is not None and distance(best)[0] <= ring * size:
+                return best
+            ring += 1
+
+    @staticmethod
+    def _ring(row: int, col: int, ring: int) -> list[tuple[int, int]]:
+        """ Returns the buckets exactly ring buckets away from (row, col). """
+        if ring == 0:
+            return [(row, col)]
+        cols = range(col - ring, col + ring + 1)
+        buckets = [(row - ring, c) for c in cols]
+        buckets.extend((row + ring, c) for c in cols)
+        for r in range(row - ring + 1, row + ring):
+            buckets.extend(((r, col - ring), (r, col + ring)))
+        return buckets
+
+
 class Level:
     """ Models one level of a game, including maze and entities. """
     ENTITIES = {
@@ -424,6 +1069,8 @@ class Level:
         HONEY: Honey,
         WATER: Water,
     }
+    # Characters of a row that add_entity does something with
+    _ENTITY_IDS = re.compile(f"[{re.escape(''.join(ENTITIES) + PLAYER)}]")
 
     def __init__(self, dimensions: tuple[int, int]) -> None:
         """ Sets up a new level with empty maze and no items or player.
@@ -433,7 +1080,9 @@ class Level:
         """
         self._maze = Maze(dimensions)
         self._items = {} # Maps positions to Item instances
+        self._index = ItemIndex()
         self._player_start = None
+        self._num_rows = 0
     
     def get_maze(self) -> Maze:
         """ Returns the Maze instance for this level. """
@@ -441,7 +1090,7 @@ class Level:
     
     def _contains_coins(self) -> bool:
         """ Returns True iff there are any more coins left in this level. """
-        return any([item.get_id() == COIN for item in self._items.values()])
+        return self._index.count(COIN) > 0
 
     def attempt_unlock_door(self) -> None:
         """ Unlocks the doors in the maze if there are no coins remaining. """
@@ -454,11 +1103,23 @@ class Level:
         Parameters:
             row: A string of tile or entity IDs.
         """
-        row_num = len(self._maze.get_tiles())
+        row_num = self._num_rows
+        self._num_rows += 1
         self._maze.add_row(row)
-        for col_num, char in enumerate(row):
-            self.add_entity((row_num, col_num), char)
+        for match in self._ENTITY_IDS.finditer(row):
+            self.add_entity((row_num, match.start()), match.group())
     
+    def add_coded_rows(self, codes: bytes) -> None:
+        """ Adds whole rows of tiles, already translated to tile codes, to the
+            maze. Entities in those rows must be added with add_entity.
+
+        Parameters:
+            codes: The codes of one or more rows, as returned by
+                   Maze.get_codes.
+        """
+        self._maze.add_coded_rows(codes)
+        self._num_rows += len(codes) // self.get_dimensions()[1]
+
     def add_entity(self, position: tuple[int, int], entity_id: str) -> None:
         """ Adds a new entity to this level.
         
@@ -466,8 +1127,13 @@ class Level:
             position: The (row, column) position at which to add the entity.
             entity_id: The ID of the entity to add.
         """
-        if self.ENTITIES.get(entity_id) is not None:
-            self._items[position] = self.ENTITIES.get(entity_id)(position)
+        entity_class = self.ENTITIES.get(entity_id)
+        if entity_class is not None:
+            replaced = self._items.get(position)
+            if replaced is not None:
+                self._index.remove(position, replaced.get_id())
+            self._items[position] = entity_class(position)
+            self._index.add(position, entity_id)
         if entity_id == PLAYER:
             self.add_player_start(position)
 
@@ -490,8 +1156,46 @@ class Level:
         Parameters:
             position: the (row, column) position from which to delete an item.
         """
-        del self._items[position]
+        self._index.remove(position, self._items.pop(position).get_id())
     
+    def count_items(self, entity_id: str) -> int:
+        """ Returns the number of items with the given ID in this level. """
+        return self._index.count(entity_id)
+
+    def get_item_positions(self, entity_id: str) -> set[tuple[int, int]]:
+        """ Returns the positions of the items with the given ID in this
+            level. The set must not be changed.
+        """
+        return self._index.get_positions(entity_id)
+
+    def get_items_in(self, top_left: tuple[int, int],
+                     bottom_right: tuple[int, int]
+                     ) -> dict[tuple[int, int], Item]:
+        """ Returns a mapping from position to Item for the items in a
+            rectangle of this level.
+
+        Parameters:
+            top_left: The (row, column) of the top left corner.
+            bottom_right: The (row, column) of the bottom right corner,
+                          included in the rectangle.
+        """
+        return {position: self._items[position]
+                for position in self._index.in_rectangle(top_left,
+                                                         bottom_right)}
+
+    def get_nearest_item_position(self, position: tuple[int, int],
+                                  entity_id: str
+                                  ) -> Optional[tuple[int, int]]:
+        """ Returns the position of the item with the given ID that is the
+            fewest moves from position, ignoring walls, or None if there are
+            none left.
+
+        Parameters:
+            position: The (row, column) position to search from.
+            entity_id: The ID of the item to find.
+        """
+        return self._index.nearest(position, entity_id)
+
     def add_player_start(self, position: tuple[int, int]) -> None:
         """ Adds the start position for the player in this level.
         
@@ -516,14 +1220,27 @@ class Level:
 
 class Model:
     """ The overall model for a game of MazeRunner """
-    def __init__(self, game_file: str) -> None:
+    def __init__(self, game_file: str, cache_dir: Optional[str] = None
+                 ) -> None:
         """ Constructs a new game.
         
         Parameters:
             game_file: The file containing the levels for this game.
+            cache_dir: Where to keep compiled copies of the levels (see
+                       CompiledLevelIndex). Defaults to the directory named
+                       by the LEVEL_CACHE_VARIABLE environment variable; if
+                       that is unset too, nothing is written and levels are
+                       parsed from the game file.
         """
-        self._levels = load_game(game_file)
+        if cache_dir is None:
+            cache_dir = os.environ.get(LEVEL_CACHE_VARIABLE)
+        # Only the current level is parsed and kept; the rest stay on disk
+        if cache_dir is None:
+            self._levels = LevelIndex(game_file)
+        else:
+            self._levels = CompiledLevelIndex(game_file, cache_dir)
         self._level_num = 0
+        self._level = self._levels.load_level(0)
         self._player = Player(self.get_level().get_player_start())
         self._won = False
         self._did_level_up = False
@@ -546,8 +1263,12 @@ class Model:
 
     def get_level(self) -> Level:
         """ Returns the current level. """
-        return self._levels[self._level_num]
+        return self._level
     
+    def get_level_num(self) -> int:
+        """ Returns the position of the current level in the game, from 0. """
+        return self._level_num
+
     def did_level_up(self) -> True:
         """ Returns True if the player just moved to the next level on the
             previous turn.
@@ -562,6 +1283,8 @@ class Model:
         if self._level_num >= len(self._levels):
             self._won = True
         else:
+            # The finished level is released when it is replaced
+            self._level = self._levels.load_level(self._level_num)
             self._player.set_position(self.get_level().get_player_start())
             self._did_level_up = True
 
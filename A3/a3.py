@@ -382,7 +382,7 @@ class GraphicalInterface(UserInterface):
         Returns:
             The number of coins in the player's inventory.
         """
-        return len(inventory.get_items().get(Coin.__name__, []))
+        return inventory.count(Coin.__name__)
 
     def get_time_played(self) -> int:
         """ Get the game played time.
@@ -555,9 +555,7 @@ class GraphicalMazeRunner(MazeRunner):
             inventory: the player's current inventory.
         """
         price, instance = SHOP_LIST[item_name]
-        if coin_num >= price:
-            for times in range(price):
-                inventory.remove_item(Coin.__name__)
+        if coin_num >= price and inventory.remove_many(Coin.__name__, price):
             inventory.add_item(instance)
             self._draw()
 
@@ -737,6 +735,7 @@ class Candy(Food):
     """ Candy restores the player's hunger to 0 when applied, but also
         reduce their health by 2.
     """
+    __slots__ = ()
     _id = CANDY
 
     def apply(self, player: Player) -> None:
@@ -0,0 +1,356 @@
+"""
+Benchmarks for loading, storing and restarting large generated levels.
+
+Usage:
+    python benchmarks.py [size] [#levels]
+"""
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from random import Random
+from statistics import median
+from typing import Callable
+
+from a2_solution import *
+
+DEFAULT_SIZE = 1000
+DEFAULT_LEVELS = 100
+# Chance of each inner cell being a wall, lava or an item
+WALL_CHANCE = 0.3
+LAVA_CHANCE = 0.05
+ITEM_CHANCE = 0.02
+ITEM_IDS = (COIN, POTION, APPLE, HONEY, WATER)
+
+
+def generate_rows(size: int, seed: int = 0) -> list[str]:
+    """ Returns the rows of a random size by size maze, walled around the
+        edge, with the player in the top left and a door in the bottom right.
+    """
+    rng = Random(seed)
+    rows = [WALL * size]
+    for _ in range(size - 2):
+        row = [WALL]
+        for _ in range(size - 2):
+            roll = rng.random()
+            if roll < WALL_CHANCE:
+                row.append(WALL)
+            elif roll < WALL_CHANCE + LAVA_CHANCE:
+                row.append(LAVA)
+            elif roll < WALL_CHANCE + LAVA_CHANCE + ITEM_CHANCE:
+                row.append(rng.choice(ITEM_IDS))
+            else:
+                row.append(EMPTY)
+        row.append(WALL)
+        rows.append(''.join(row))
+    rows[1] = WALL + PLAYER + rows[1][2:]
+    rows.append(WALL * (size - 1) + DOOR)
+    return rows
+
+
+def generate_sparse_rows(size: int, seed: int = 0) -> list[str]:
+    """ Returns the rows of a size by size maze of long corridors: every
+        other row is a wall with one gap, and items are rare.
+    """
+    rng = Random(seed)
+    rows = [WALL * size]
+    for row_num in range(1, size - 1):
+        if row_num % 2 == 0:
+            gap = rng.randrange(1, size - 1)
+            rows.append(WALL * gap + EMPTY + WALL * (size - gap - 1))
+            continue
+        row = [WALL] + [EMPTY] * (size - 2) + [WALL]
+        if rng.random() < ITEM_CHANCE * 10:
+            row[rng.randrange(1, size - 1)] = rng.choice(ITEM_IDS)
+        rows.append(''.join(row))
+    rows[1] = WALL + PLAYER + rows[1][2:]
+    rows.append(WALL * (size - 1) + DOOR)
+    return rows
+
+
+def write_game(path: str, levels: list[list[str]], runs: bool = False
+               ) -> None:
+    """ Writes levels to path in the game file format, with every row written
+        as runs if runs is True.
+    """
+    with open(path, 'w') as file:
+        for number, rows in enumerate(levels, 1):
+            file.write(f"Maze {number} - {len(rows)} {len(rows[0])}\n")
+            if runs:
+                rows = [encode_runs(row) for row in rows]
+            file.write('\n'.join(rows))
+            file.write('\n\n')
+
+
+def measure(build: Callable[[], object]) -> tuple[object, float, int]:
+    """ Returns what build returns, the seconds it took and the bytes it
+        allocated that are still in use.
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - start
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, size
+
+
+def _object_grid(rows: list[str]) -> list[list[Tile]]:
+    """ Builds one Tile instance per cell, as Maze did before it stored tile
+        codes.
+    """
+    return [[Maze.TILES.get(char, Empty)() for char in row] for row in rows]
+
+
+def benchmark_maze(size: int = DEFAULT_SIZE) -> None:
+    """ Prints the load time and memory of a size by size maze stored as a
+        grid of tile objects and as a Maze.
+    """
+    rows = generate_rows(size)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'large.txt')
+        write_game(path, [rows])
+        _, grid_time, grid_size = measure(lambda: _object_grid(rows))
+        levels, load_time, level_size = measure(lambda: load_game(path))
+        maze = levels[0].get_maze()
+        _, maze_time, maze_size = measure(lambda: _build_maze(rows))
+
+    print(f"{size} x {size} maze ({size * size:,} cells)")
+    print(f"  tile objects: {grid_time:6.2f}s {grid_size / 2 ** 20:8.1f} MiB")
+    print(f"  Maze:         {maze_time:6.2f}s {maze_size / 2 ** 20:8.1f} MiB")
+    print(f"  load_game:    {load_time:6.2f}s {level_size / 2 ** 20:8.1f} MiB"
+          f" (with items)")
+    assert str(maze) == _str_of(rows)
+
+
+def _build_maze(rows: list[str]) -> Maze:
+    """ Builds a Maze from rows. """
+    maze = Maze((len(rows), len(rows[0])))
+    for row in rows:
+        maze.add_row(row)
+    return maze
+
+
+def _str_of(rows: list[str]) -> str:
+    """ Returns the string of a maze of rows, with entities shown as empty. """
+    ground = {WALL, LAVA, DOOR}
+    return '\n'.join(
+        ''.join(char if char in ground else EMPTY for char in row)
+        for row in rows
+    )
+
+
+def benchmark_startup(size: int = DEFAULT_SIZE // 4,
+                      num_levels: int = DEFAULT_LEVELS) -> None:
+    """ Prints how long a game of num_levels size by size levels takes to
+        start, parsing every level up front and parsing only the first.
+    """
+    level = generate_rows(size)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'long.txt')
+        write_game(path, [level] * num_levels)
+        _, eager_time, eager_size = measure(lambda: load_game(path))
+        model, lazy_time, lazy_size = measure(lambda: Model(path))
+        start = time.perf_counter()
+        model.level_up()
+        level_up_time = time.perf_counter() - start
+
+    print(f"{num_levels} levels of {size} x {size}")
+    print(f"  load_game: {eager_time:6.2f}s {eager_size / 2 ** 20:8.1f} MiB")
+    print(f"  Model:     {lazy_time:6.2f}s {lazy_size / 2 ** 20:8.1f} MiB")
+    print(f"  level_up:  {level_up_time:6.2f}s")
+
+
+def benchmark_restart(size: int = DEFAULT_SIZE // 4,
+                      num_levels: int = DEFAULT_LEVELS) -> None:
+    """ Prints how long a game of num_levels size by size levels takes to
+        start or restart, parsing the game file and reading the compiled copy
+        of its first level.
+    """
+    level = generate_rows(size)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'long.txt')
+        write_game(path, [level] * num_levels)
+        start = time.perf_counter()
+        LevelIndex(path).load_level(0)
+        text_time = time.perf_counter() - start
+        start = time.perf_counter()
+        Model(path)
+        cold_time = time.perf_counter() - start
+        start = time.perf_counter()
+        Model(path)
+        warm_time = time.perf_counter() - start
+
+    print(f"{num_levels} levels of {size} x {size}")
+    print(f"  from text:  {text_time:6.3f}s")
+    print(f"  cold cache: {cold_time:6.3f}s")
+    print(f"  warm cache: {warm_time:6.3f}s")
+
+
+def benchmark_sparse(size: int = DEFAULT_SIZE * 4) -> None:
+    """ Prints the file size, load time and memory of a size by size maze of
+        long corridors, written as plain rows and as runs, and loaded with
+        and without run-length rows in memory.
+    """
+    rows = generate_sparse_rows(size)
+    print(f"{size} x {size} sparse maze ({size * size:,} cells)")
+    with tempfile.TemporaryDirectory() as directory:
+        for runs in (False, True):
+            path = os.path.join(directory, f'sparse{runs}.txt')
+            write_game(path, [rows], runs)
+            file_size = os.path.getsize(path)
+            for min_run_length in (size + 1, Maze.MIN_RUN_LENGTH):
+                default = Maze.MIN_RUN_LENGTH
+                Maze.MIN_RUN_LENGTH = min_run_length
+                try:
+                    _, load_time, level_size = measure(lambda: load_game(path))
+                finally:
+                    Maze.MIN_RUN_LENGTH = default
+                syntax = 'runs' if runs else 'plain'
+                memory = 'runs' if min_run_length <= size else 'bytes'
+                print(f"  {syntax:>5} file ({file_size / 2 ** 20:6.1f} MiB), "
+                      f"{memory:>5} rows: {load_time:6.2f}s "
+                      f"{level_size / 2 ** 20:8.1f} MiB")
+
+
+def benchmark_moves(size: int = DEFAULT_SIZE, num_moves: int = 10_000
+                    ) -> None:
+    """ Prints the time the model spends after each move of the player on a
+        size by size level, collecting any item and checking the door.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'moves.txt')
+        write_game(path, [generate_rows(size)])
+        model = Model(path)
+    position = model.get_player().get_position()
+    start = time.perf_counter()
+    for _ in range(num_moves):
+        model.attempt_collect_item(position)
+    elapsed = time.perf_counter() - start
+    print(f"{size} x {size} level: {elapsed / num_moves * 1e6:10.1f}us "
+          f"per move")
+
+
+def benchmark_items(num_items: int = 1_000_000, num_queries: int = 100
+                    ) -> None:
+    """ Prints the median time of item queries on a level with num_items
+        items, made through the item index and by scanning every item.
+    """
+    size = int((num_items / ITEM_CHANCE) ** 0.5)
+    rng = Random(0)
+    level = Level([size, size])
+    _, build_time, build_size = measure(lambda: [
+        level.add_entity((rng.randrange(size), rng.randrange(size)),
+                         rng.choice(ITEM_IDS))
+        for _ in range(num_items)
+    ])
+    items = level.get_items()
+    print(f"{len(items):,} items on a {size} x {size} level: "
+          f"built in {build_time:.2f}s, {build_size / 2 ** 20:.1f} MiB")
+
+    def window(position: tuple[int, int]) -> tuple[tuple[int, int], ...]:
+        return position, (position[0] + 20, position[1] + 40)
+
+    def scan_window(position: tuple[int, int]) -> dict:
+        (top, left), (bottom, right) = window(position)
+        return {position: item for position, item in items.items()
+                if top <= position[0] <= bottom
+                and left <= position[1] <= right}
+
+    def scan_nearest(position: tuple[int, int]) -> tuple[int, int]:
+        coins = [other for other, item in items.items()
+                 if item.get_id() == COIN]
+        return min(coins, key=lambda other: (
+            abs(other[0] - position[0]) + abs(other[1] - position[1]), other
+        ))
+
+    queries = {
+        'count coins': (
+            lambda position: level.count_items(COIN),
+            lambda position: sum(item.get_id() == COIN
+                                 for item in items.values()),
+        ),
+        '20 x 40 window': (
+            lambda position: level.get_items_in(*window(position)),
+            scan_window,
+        ),
+        'nearest coin': (
+            lambda position: level.get_nearest_item_position(position, COIN),
+            scan_nearest,
+        ),
+    }
+    positions = [(rng.randrange(size), rng.randrange(size))
+                 for _ in range(num_queries)]
+    for name, (indexed, scan) in queries.items():
+        times = []
+        for query in (indexed, scan):
+            results, query_times = [], []
+            for position in positions:
+                start = time.perf_counter()
+                results.append(query(position))
+                query_times.append(time.perf_counter() - start)
+            # The median, as the odd query pays for a collection of the
+            # whole heap
+            times.append(median(query_times))
+        assert results == [indexed(position) for position in positions]
+        print(f"  {name:>14}: {times[0] * 1e6:10.1f}us indexed, "
+              f"{times[1] * 1e6:10.1f}us scanning")
+
+
+class _UnslottedItem:
+    """ An item with a position and a __dict__, as each item was before
+        items had __slots__.
+    """
+
+    def __init__(self, position: tuple[int, int]) -> None:
+        self._position = position
+
+
+def benchmark_item_memory(num_items: int = 1_000_000) -> None:
+    """ Prints the memory per item of num_items items stored one instance
+        per item, with and without __slots__, not counting the position
+        tuples they are stored under. Then prints the
+        memory per item of a level holding them, with its item index.
+    """
+    size = int((num_items / ITEM_CHANCE) ** 0.5)
+    rng = Random(0)
+    positions = {(rng.randrange(size), rng.randrange(size)): None
+                 for _ in range(num_items)}
+    stores = {
+        'instance with __dict__': lambda: {
+            position: _UnslottedItem(position) for position in positions
+        },
+        'slotted instance': lambda: {
+            position: Coin(position) for position in positions
+        },
+    }
+    print(f"{len(positions):,} items")
+    for name, build in stores.items():
+        _, _, store_size = measure(build)
+        print(f"  {name:>22}: {store_size / len(positions):6.1f} bytes "
+              f"per item")
+
+    def build_level() -> Level:
+        level = Level([size, size])
+        for position in positions:
+            level.add_entity(position, COIN)
+        return level
+
+    _, _, level_size = measure(build_level)
+    print(f"  {'Level with its index':>22}: "
+          f"{level_size / len(positions):6.1f} bytes per item")
+
+
+if __name__ == '__main__':
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_SIZE
+    num_levels = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_LEVELS
+    benchmark_maze(size)
+    benchmark_startup(size // 4, num_levels)
+    benchmark_restart(size // 4, num_levels)
+    benchmark_sparse(size * 4)
+    benchmark_moves(size)
+    benchmark_items()
+    benchmark_item_memory()
@@ -168,7 +168,7 @@ class GraphicalInterface(UserInterface):
     def _draw_inventory(self, inventory: 'Inventory') -> None:
         # 在之前的基础上还要draw coins
         self.draw_inventory(inventory)
-        self._stats_view.draw_coins(len(inventory.get_items().get(Coin.__name__, [])))
+        self._stats_view.draw_coins(inventory.count(Coin.__name__))
 
     def _draw_level(self, maze: 'Maze', items: dict[tuple[int, int], 'Item'], player_position: tuple[int, int]) -> None:
         if TASK == 1:
@@ -0,0 +1,206 @@
+"""
+Headless simulation of MazeRunner games.
+
+Plays random sequences of the commands MazeRunner accepts (moves and item
+uses) straight against Model, with no interface and nothing drawn, until
+each game is won, lost or runs out of commands. Games are spread over
+worker processes, and the totals for each game file are reported with the
+commands applied per second, a throughput baseline for Model.move_player and
+the level logic behind it.
+
+Usage:
+    python simulate.py [game file ...] [--games N] [--commands N]
+                       [--workers N] [--seed N] [--cache-dir DIR]
+"""
+from __future__ import annotations
+
+import argparse
+import glob
+import time
+from multiprocessing import Pool, cpu_count
+from random import Random
+from typing import Iterable, Iterator, Optional
+
+from a2_solution import *
+
+GAMES_PATTERN = 'games/*.txt'
+DEFAULT_GAMES = 1000
+DEFAULT_COMMANDS = 1000
+# Chance of each command being an item use rather than a move
+ITEM_USE_CHANCE = 0.1
+ITEM_NAMES = (Apple.__name__, Honey.__name__, Potion.__name__, Water.__name__)
+
+# How a game ended
+WON, LOST, UNFINISHED = 'won', 'lost', 'unfinished'
+
+
+class HeadlessRunner:
+    """ Applies commands to a game of MazeRunner, as MazeRunner does for
+        typed input, without drawing or prompting.
+    """
+    def __init__(self, game_file: str, cache_dir: Optional[str] = None
+                 ) -> None:
+        """ Starts a new game.
+
+        Parameters:
+            game_file: The file containing the levels for this game.
+            cache_dir: Where to keep compiled levels, as for Model.
+        """
+        self._model = Model(game_file, cache_dir)
+        self._player = self._model.get_player()
+
+    def get_model(self) -> Model:
+        """ Returns the model of the game being played. """
+        return self._model
+
+    def apply(self, command: str) -> bool:
+        """ Applies one command: a move, or 'i' then the name of an item to
+            use.
+
+        Parameters:
+            command: The command, as a user would type it into MazeRunner.
+
+        Returns:
+            False iff the command was invalid or named an item the player
+            does not have.
+        """
+        delta = MOVE_DELTAS.get(command)
+        if delta is not None:
+            self._model.move_player(delta)
+            return True
+        if command[:2] != 'i ':
+            return False
+        item = self._player.get_inventory().remove_item(command[2:])
+        if item is None:
+            return False
+        item.apply(self._player)
+        return True
+
+    def run(self, commands: Iterable[str]) -> tuple[str, int]:
+        """ Applies commands until the game is won or lost or they run out.
+
+        Returns:
+            How the game ended and the number of commands applied.
+        """
+        model = self._model
+        applied = 0
+        for command in commands:
+            self.apply(command)
+            applied += 1
+            if model.has_won():
+                return WON, applied
+            if model.has_lost():
+                return LOST, applied
+        return UNFINISHED, applied
+
+
+def random_commands(rng: Random, count: int) -> Iterator[str]:
+    """ Yields count random commands, mostly moves. """
+    moves = tuple(MOVE_DELTAS)
+    for _ in range(count):
+        if rng.random() < ITEM_USE_CHANCE:
+            yield 'i ' + rng.choice(ITEM_NAMES)
+        else:
+            yield rng.choice(moves)
+
+
+def play_game(task: tuple[str, int, int, Optional[str]]) -> tuple:
+    """ Plays one game of random commands.
+
+    Parameters:
+        task: The game file, the seed of the commands, how many there are and
+              where to keep compiled levels (None for the Model default).
+
+    Returns:
+        The game file, how the game ended, the commands applied, the seconds
+         spent applying them, the level reached (from 0) and the player's
+         final (health, hunger, thirst).
+    """
+    game_file, seed, count, cache_dir = task
+    runner = HeadlessRunner(game_file, cache_dir)
+    commands = list(random_commands(Random(seed), count))
+    start = time.perf_counter()
+    outcome, applied = runner.run(commands)
+    elapsed = time.perf_counter() - start
+    model = runner.get_model()
+    return (game_file, outcome, applied, elapsed, model.get_level_num(),
+            model.get_player_stats())
+
+
+def run(
+    game_files: list[str], games: int, count: int, workers: int = 1,
+    seed: int = 0, cache_dir: Optional[str] = None
+) -> tuple[dict[str, dict], float]:
+    """ Plays games random games, cycling through game_files, across
+        workers.
+
+    Returns:
+        The totals for each game file, and the wall time taken in seconds.
+        Each total maps 'games', 'commands' and 'seconds', each way a game
+        can end, 'levels' (levels completed) and 'health', 'hunger' and
+        'thirst' (final stats) to their sums over the file's games.
+    """
+    tasks = [(game_files[game % len(game_files)], seed * 1_000_003 + game,
+              count, cache_dir) for game in range(games)]
+    start = time.perf_counter()
+    if workers <= 1:
+        results = [play_game(task) for task in tasks]
+    else:
+        with Pool(workers) as pool:
+            results = pool.map(play_game, tasks,
+                               chunksize=max(1, len(tasks) // (4 * workers)))
+    elapsed = time.perf_counter() - start
+
+    totals: dict[str, dict] = {}
+    for game_file, outcome, applied, seconds, level_num, stats in results:
+        total = totals.setdefault(game_file, dict.fromkeys(
+            ('games', 'commands', 'seconds', WON, LOST, UNFINISHED, 'levels',
+             'health', 'hunger', 'thirst'), 0
+        ))
+        total['games'] += 1
+        total['commands'] += applied
+        total['seconds'] += seconds
+        total[outcome] += 1
+        total['levels'] += level_num + (outcome == WON)
+        for name, value in zip(('health', 'hunger', 'thirst'), stats):
+            total[name] += value
+    return totals, elapsed
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    """ Entry-point for simulating games from the command line. """
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[1])
+    parser.add_argument('game_files', nargs='*', metavar='game file',
+                        help=f'games to play; {GAMES_PATTERN} by default')
+    parser.add_argument('--games', type=int, default=DEFAULT_GAMES)
+    parser.add_argument('--commands', type=int, default=DEFAULT_COMMANDS,
+                        help='most commands to apply in each game')
+    parser.add_argument('--workers', type=int, default=cpu_count())
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--cache-dir',
+                        help='keep compiled levels in this directory')
+    args = parser.parse_args(argv)
+    game_files = args.game_files or sorted(glob.glob(GAMES_PATTERN))
+    if not game_files:
+        parser.error('no game files')
+
+    totals, elapsed = run(game_files, args.games, args.commands,
+                          args.workers, args.seed, args.cache_dir)
+    commands = sum(total['commands'] for total in totals.values())
+    seconds = sum(total['seconds'] for total in totals.values())
+    print(f"{args.games:,} games, {commands:,} commands in {elapsed:.1f}s: "
+          f"{commands / max(seconds, 1e-9):,.0f} commands per second "
+          f"per worker, {commands / elapsed:,.0f} overall")
+    for game_file, total in totals.items():
+        games = total['games']
+        print(f"{game_file}: {games:,} games, {total[WON]:,} won, "
+              f"{total[LOST]:,} lost, {total[UNFINISHED]:,} unfinished, "
+              f"{total['levels'] / games:.2f} levels completed, "
+              f"{total['commands'] / games:.1f} commands")
+        print(f"  mean final health {total['health'] / games:.1f}, "
+              f"hunger {total['hunger'] / games:.1f}, "
+              f"thirst {total['thirst'] / games:.1f}")
+
+
+if __name__ == '__main__':
+    main()
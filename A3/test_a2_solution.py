@@ -0,0 +1,249 @@
+""" Tests for the MazeRunner model in a2_solution. """
+import os
+from random import Random
+
+import pytest
+
+from a2_solution import *
+from a2_solution import _parse_level
+
+GAMES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'games')
+
+
+def game_path(name: str) -> str:
+    """ Returns the path of one of the bundled game files. """
+    return os.path.join(GAMES_DIR, name)
+
+
+def test_items_keep_their_positions():
+    level = Level([2, 3])
+    level.add_row('#C ')
+    level.add_row(' MP')
+    coin = level.get_items()[(0, 1)]
+    assert coin.get_position() == (0, 1)
+    assert repr(coin) == 'Coin((0, 1))'
+    assert repr(level.get_items()) == (
+        '{(0, 1): Coin((0, 1)), (1, 1): Potion((1, 1))}'
+    )
+
+
+def test_level_str_lists_positioned_items():
+    level = Model(game_path('game1.txt')).get_level()
+    assert str(level).splitlines()[-2:] == [
+        'Items: {(1, 2): Coin((1, 2)), (2, 2): Coin((2, 2)), '
+        '(3, 2): Coin((3, 2))}',
+        'Player start: (3, 0)',
+    ]
+
+
+def test_expand_runs():
+    assert expand_runs('12#3 C') == '#' * 12 + '   C'
+    assert expand_runs('#2 M') == '#  M'
+    assert expand_runs('') == ''
+
+
+def test_encode_runs_round_trips():
+    row = '#' * 20 + ' ' * 5 + 'C' + '#' * 10
+    encoded = encode_runs(row)
+    assert encoded == '=20#5 C10#'
+    assert expand_runs(encoded[len(RUN_LENGTH_ROW):]) == row
+
+
+@pytest.mark.parametrize('runs', ['#3', '3', '12#4', '#2 7'])
+def test_malformed_runs_are_rejected(runs):
+    with pytest.raises(ValueError):
+        expand_runs(runs)
+
+
+def test_run_length_rows_load_like_plain_rows():
+    plain = _parse_level(['Maze 1 - 3 40', '#' * 40,
+                          '#' * 18 + ' C' + ' ' * 19 + 'D', '#' * 40])
+    runs = _parse_level(['Maze 1 - 3 40', '=40#', '=18# C19 D', '=40#'])
+    assert str(runs.get_maze()) == str(plain.get_maze())
+    assert runs.get_items().keys() == plain.get_items().keys()
+    assert runs.get_maze().get_tile((1, 39)).get_id() == DOOR
+
+
+def test_run_rows_report_their_length():
+    maze = Maze((2, 40))
+    maze.add_row('#' * 40)
+    maze.add_row('#' * 18 + ' ' * 22)
+    assert [len(row) for row in maze._rows] == [40, 40]
+    empty = Maze((1, 0))
+    empty.add_row('')
+    assert len(empty._rows[0]) == 0
+    assert bytes(empty._rows[0]) == b''
+
+
+def test_compiled_levels_match_parsed_levels(tmp_path, monkeypatch):
+    path = game_path('game2.txt')
+    plain = LevelIndex(path)
+    compiled = CompiledLevelIndex(path, str(tmp_path))
+    assert compiled.get_offsets() == plain.get_offsets()
+    levels = [str(compiled.load_level(i)) for i in range(len(plain))]
+    assert levels == [str(plain.load_level(i)) for i in range(len(plain))]
+
+    def parse_again(self, level_num):
+        raise AssertionError('level was parsed again')
+
+    monkeypatch.setattr(LevelIndex, 'load_level', parse_again)
+    monkeypatch.setattr(LevelIndex, '_scan', parse_again)
+    reopened = CompiledLevelIndex(path, str(tmp_path))
+    assert [str(reopened.load_level(i)) for i in range(len(plain))] == levels
+
+
+@pytest.mark.parametrize('damage', [
+    lambda data: b'',
+    lambda data: data[:-1],
+    lambda data: data[:-1] + bytes([data[-1] ^ 1]),
+    lambda data: b'XXXX' + data[4:],
+])
+def test_corrupt_compiled_files_are_rebuilt(tmp_path, damage):
+    path = game_path('game2.txt')
+    expected = str(LevelIndex(path).load_level(0))
+    compiled = CompiledLevelIndex(path, str(tmp_path))
+    compiled.load_level(0)
+    (directory,) = tmp_path.iterdir()
+
+    for name in ('index', '0.lvl'):
+        data = (directory / name).read_bytes()
+        (directory / name).write_bytes(damage(data))
+    reopened = CompiledLevelIndex(path, str(tmp_path))
+    assert str(reopened.load_level(0)) == expected
+    assert reopened.get_offsets() == compiled.get_offsets()
+    assert (directory / '0.lvl').read_bytes() == data
+
+
+def test_changed_game_files_are_recompiled(tmp_path):
+    path = tmp_path / 'game.txt'
+    cache_dir = tmp_path / 'cache'
+    path.write_bytes(open(game_path('game1.txt'), 'rb').read())
+    CompiledLevelIndex(str(path), str(cache_dir)).load_level(0)
+    (old,) = cache_dir.iterdir()
+
+    with open(path, 'a') as file:
+        file.write('\n')
+    compiled = CompiledLevelIndex(str(path), str(cache_dir))
+    expected = LevelIndex(str(path)).load_level(0)
+    assert str(compiled.load_level(0)) == str(expected)
+    assert [entry.name for entry in cache_dir.iterdir()] != [old.name]
+    assert not old.exists()
+
+
+def test_compiled_cache_is_opt_in(tmp_path, monkeypatch):
+    monkeypatch.delenv(LEVEL_CACHE_VARIABLE, raising=False)
+    assert type(Model(game_path('game1.txt'))._levels) is LevelIndex
+
+    Model(game_path('game1.txt'), cache_dir=str(tmp_path / 'given'))
+    monkeypatch.setenv(LEVEL_CACHE_VARIABLE, str(tmp_path / 'from_env'))
+    Model(game_path('game1.txt'))
+    assert sorted(entry.name for entry in tmp_path.iterdir()) == [
+        'from_env', 'given'
+    ]
+
+
+def _scattered_index(count: int) -> tuple[ItemIndex, dict]:
+    """ Returns an index of count random items and the positions of each ID.
+    """
+    rng = Random(count)
+    index = ItemIndex()
+    positions = {COIN: set(), POTION: set()}
+    while sum(map(len, positions.values())) < count:
+        position = (rng.randrange(300), rng.randrange(300))
+        if any(position in taken for taken in positions.values()):
+            continue
+        entity_id = rng.choice((COIN, POTION))
+        positions[entity_id].add(position)
+        index.add(position, entity_id)
+    return index, positions
+
+
+@pytest.mark.parametrize('count', [40, 2000])
+def test_item_index_finds_the_nearest_item(count):
+    index, positions = _scattered_index(count)
+    rng = Random(0)
+    for _ in range(50):
+        row, col = rng.randrange(-20, 320), rng.randrange(-20, 320)
+        expected = min(
+            positions[COIN],
+            key=lambda p: (abs(p[0] - row) + abs(p[1] - col), p),
+        )
+        assert index.nearest((row, col), COIN) == expected
+    assert index.nearest((0, 0), HONEY) is None
+
+
+def test_item_index_queries_rectangles():
+    index, positions = _scattered_index(2000)
+    found = sorted(index.in_rectangle((30, 70), (100, 95)))
+    assert found == sorted(
+        (row, col) for taken in positions.values() for row, col in taken
+        if 30 <= row <= 100 and 70 <= col <= 95
+    )
+
+
+def test_item_index_forgets_removed_items():
+    index, positions = _scattered_index(2000)
+    for position in list(positions[COIN])[:500]:
+        index.remove(position, COIN)
+        positions[COIN].discard(position)
+    assert index.count(COIN) == len(positions[COIN])
+    assert index.get_positions(COIN) == positions[COIN]
+    assert sorted(index.in_rectangle((0, 0), (299, 299))) == sorted(
+        positions[COIN] | positions[POTION]
+    )
+
+
+def test_level_keeps_its_item_index_current():
+    level = Level((3, 4))
+    level.add_row('C MC')
+    level.add_row(' P  ')
+    level.add_row('#  C')
+    assert level.count_items(COIN) == 3
+    assert level.get_nearest_item_position((1, 1), COIN) == (0, 0)
+
+    level.add_entity((0, 0), POTION)
+    level.remove_item((0, 3))
+    assert level.count_items(COIN) == 1
+    assert level.get_item_positions(POTION) == {(0, 0), (0, 2)}
+    assert level.get_nearest_item_position((1, 1), COIN) == (2, 3)
+    assert sorted(level.get_items_in((0, 0), (1, 3))) == [(0, 0), (0, 2)]
+
+
+def test_inventory_counts_items_by_name():
+    coin, other_coin, potion = Coin((0, 1)), Coin((2, 3)), Potion((1, 1))
+    inventory = Inventory([coin, potion, other_coin])
+    inventory.add_many(Coin((4, 4)), 3)
+    assert inventory.count('Coin') == 5
+    assert inventory.count('Potion') == 1
+    assert inventory.count('Honey') == 0
+    assert str(inventory) == 'Coin: 5\nPotion: 1'
+    assert repr(inventory) == (
+        'Inventory(initial_items=[' + 'Coin((0, 1)), ' * 5 + 'Potion((1, 1))])'
+    )
+
+
+def test_inventory_removes_whole_amounts_only():
+    inventory = Inventory()
+    inventory.add_many(Coin((0, 0)), 3)
+    assert not inventory.remove_many('Coin', 4)
+    assert inventory.count('Coin') == 3
+    assert inventory.remove_many('Coin', 2)
+    assert inventory.remove_item('Coin').get_name() == 'Coin'
+    assert inventory.remove_item('Coin') is None
+    assert 'Coin' not in inventory.get_items()
+    with pytest.raises(ValueError):
+        inventory.remove_many('Coin', -1)
+    with pytest.raises(ValueError):
+        inventory.add_many(Coin((0, 0)), -1)
+
+
+def test_inventory_items_view_follows_changes():
+    potion = Potion((1, 1))
+    inventory = Inventory([potion])
+    items = inventory.get_items()
+    inventory.add_many(potion, 2)
+    assert dict(items) == {'Potion': [potion, potion, potion]}
+    inventory.remove_many('Potion', 3)
+    assert len(items) == 0
+    with pytest.raises(TypeError):
+        items['Potion'] = [potion]